@@ -8,7 +8,7 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from .env_config import load_env_file
 
 # Base directory
@@ -52,6 +52,21 @@ def _write_audit_entry(entry: dict):
         logging.error(f"Failed to write audit log: {e}")
 
 
+def _write_audit_entries(entries: List[dict]):
+    """Write several audit entries to the log file with a single append"""
+    if not entries or not is_audit_logging_enabled():
+        return
+
+    _ensure_log_directory()
+    log_path = get_audit_log_path()
+
+    try:
+        with open(log_path, 'a') as f:
+            f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+    except Exception as e:
+        logging.error(f"Failed to write audit log: {e}")
+
+
 class AuditLogger:
     """
     Audit logger for tracking device operations
@@ -161,6 +176,34 @@ class AuditLogger:
             status = "SUCCESS" if success else f"FAILED: {error_message}"
             logging.info(f"[AUDIT] Command on {device_name}: '{command}' - {status} ({duration_seconds:.3f}s)")
 
+    @classmethod
+    def log_bulk(cls, events: List[dict]):
+        """
+        Log a batch of queued command executions with one file write
+
+        Each event holds the log_command_execution arguments plus the
+        'timestamp' captured when the command ran.
+        """
+        if not events:
+            return
+
+        entries = [{
+            'timestamp': event['timestamp'],
+            'event_type': 'COMMAND_EXECUTE',
+            'device_id': event['device_id'],
+            'device_name': event['device_name'],
+            'command': event['command'],
+            'success': event['success'],
+            'duration_seconds': round(event['duration_seconds'], 3),
+            'error_message': event.get('error_message'),
+            'output_lines': event.get('output_lines')
+        } for event in events]
+        _write_audit_entries(entries)
+
+        if is_audit_logging_enabled():
+            failed = sum(1 for entry in entries if not entry['success'])
+            logging.info(f"[AUDIT] {len(entries)} commands logged ({failed} failed)")
+
     @classmethod
     def log_automation_job_start(cls, job_id: str, device_count: int, command_count: int,
                                   user: Optional[str] = None):
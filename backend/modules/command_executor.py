@@ -5,20 +5,26 @@ Executes show commands and saves output to files
 
 import logging
 import os
+import collections
 import re
+import tempfile
 import threading
 import uuid
 import time
 import json
 from datetime import datetime
 from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .connection_manager import connection_manager, DeviceConnectionError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from .connection_manager import connection_manager, DeviceConnectionError, POOL_ENABLED
+from .file_manager import invalidate_list_cache
 from .audit_logger import AuditLogger
 from .websocket_manager import websocket_manager
 
 logger = logging.getLogger(__name__)
 
+# Backend root directory (parent of modules/), resolved once at import
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Standard OSPF data collection commands
 OSPF_COMMANDS = [
     "terminal length 0",  # Disable pagination
@@ -54,6 +60,19 @@ COMMAND_TIMEOUTS = {
 }
 DEFAULT_TIMEOUT = 60  # Default timeout for other commands
 
+# "show bundle" parsing patterns (IOS-XR). Member rows are matched per line
+# across the whole member table, so whitespace is restricted to [ \t].
+_RE_BUNDLE_HEADER = re.compile(r'^(Bundle-Ether\d+|BE\d+)', re.MULTILINE)
+_RE_BUNDLE_MEMBER_HEADER = re.compile(r'Port[ \t]+.*State', re.IGNORECASE)
+_RE_BUNDLE_MEMBER = re.compile(
+    r'^[ \t]*((?:Gi|Te|Hu|GigabitEthernet|TenGigE|HundredGigE)\S*)[ \t]+'  # Interface
+    r'(\w+)[ \t]+'  # Device (Local/Remote)
+    r'(\w+)[ \t]+'  # State (Active/Standby)
+    r'\S+,[ \t]+\S+[ \t]+'  # Port ID (0x8000, 0x0002)
+    r'(\d+)',  # Bandwidth in kbps at end
+    re.MULTILINE
+)
+
 def get_command_timeout(command: str) -> int:
     """Get appropriate timeout for a command based on its type."""
     cmd_lower = command.lower().strip()
@@ -62,10 +81,26 @@ def get_command_timeout(command: str) -> int:
             return timeout
     return DEFAULT_TIMEOUT
 
+def _atomic_write_json(path: str, data: Dict):
+    """Write JSON to path atomically (temp file in same dir + os.replace)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".metadata-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
 class JobManager:
     """Manages background automation jobs"""
     def __init__(self):
         self.jobs = {}
+        # Per-job stop events kept outside the job dicts (which are returned as JSON)
+        self.stop_events: Dict[str, threading.Event] = {}
         self.lock = threading.Lock()
 
     def _broadcast_job_state(self, job_id: str, event_type: str = "update"):
@@ -145,6 +180,7 @@ class JobManager:
                 "current_device": None,
                 "execution_id": None  # Will be set by start_automation_job
             }
+            self.stop_events[job_id] = threading.Event()
             # Broadcast job created event
             self._broadcast_job_state(job_id, "job_created")
         return job_id
@@ -352,6 +388,8 @@ class JobManager:
             if job and job["status"] == "running":
                 job["stop_requested"] = True
                 job["status"] = "stopping"
+                if job_id in self.stop_events:
+                    self.stop_events[job_id].set()
                 # Broadcast job stopping event
                 self._broadcast_job_state(job_id, "job_stopping")
 
@@ -359,6 +397,19 @@ class JobManager:
         with self.lock:
             job = self.jobs.get(job_id)
             return job.get("stop_requested", False) if job else False
+
+    def get_stop_event(self, job_id: str) -> threading.Event:
+        """Get the event that is set when a stop is requested for the job"""
+        with self.lock:
+            event = self.stop_events.get(job_id)
+            if event is None:
+                event = self.stop_events[job_id] = threading.Event()
+            return event
+
+    def discard_stop_event(self, job_id: str):
+        """Drop the job's stop event once the job has finished, failed or been stopped"""
+        with self.lock:
+            self.stop_events.pop(job_id, None)
     
     def update_device_status(self, job_id: str, device_id: str, status: str, error: str = None):
         """Update device connection/execution status"""
@@ -383,7 +434,7 @@ class JobManager:
                     "country": device_progress["country"],
                     "status": status
                 }
-            elif status in ["completed", "failed", "disconnected"]:
+            elif status in ["completed", "failed", "disconnected", "released"]:
                 # Clear current device if this was the active one
                 if job.get("current_device", {}).get("device_id") == device_id:
                     job["current_device"] = None
@@ -400,8 +451,7 @@ class CommandExecutor:
         # Support execution-based isolation
         if execution_id:
             # Use execution-specific directory
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            exec_dir = os.path.join(base_dir, "data", "executions", execution_id)
+            exec_dir = os.path.join(_BACKEND_DIR, "data", "executions", execution_id)
             self.text_output_dir = os.path.join(exec_dir, "TEXT")
             self.json_output_dir = os.path.join(exec_dir, "JSON")
             self.execution_id = execution_id
@@ -417,6 +467,13 @@ class CommandExecutor:
         os.makedirs(self.text_output_dir, exist_ok=True)
         os.makedirs(self.json_output_dir, exist_ok=True)
 
+        # Separator-terminated prefixes so per-command paths are a plain concatenation
+        self._text_dir_prefix = os.path.join(self.text_output_dir, "")
+        self._json_dir_prefix = os.path.join(self.json_output_dir, "")
+
+        # Command audit events, flushed to the audit log once per batch
+        self._audit_queue = collections.deque()
+
         logger.info(f"CommandExecutor initialized - Execution: {execution_id or 'legacy'}, Text: {self.text_output_dir}")
 
     def check_device_health(self, device_id: str, device_name: str) -> Dict:
@@ -694,23 +751,28 @@ class CommandExecutor:
             #   --------------- ------------- ---------- ----------------
             #   Gi0/0/0/1       1G            Active     0x8000, 0x0001
             bundles = []
-            current_bundle = None
-            in_member_section = False
+            headers = list(_RE_BUNDLE_HEADER.finditer(output))
+
+            for idx, header in enumerate(headers):
+                block_end = headers[idx + 1].start() if idx + 1 < len(headers) else len(output)
+                current_bundle = {
+                    "bundle_name": header.group(1),
+                    "status": "Unknown",
+                    "members": [],
+                    "total_bandwidth_kbps": 0,
+                    "active_bandwidth_kbps": 0
+                }
 
-            for line in output.splitlines():
-                # Match bundle header: "Bundle-Ether200" or "BE200"
-                bundle_match = re.match(r'^(Bundle-Ether\d+|BE\d+)', line)
-                if bundle_match:
-                    if current_bundle:
-                        bundles.append(current_bundle)
-                    current_bundle = {
-                        "bundle_name": bundle_match.group(1),
-                        "status": "Unknown",
-                        "members": [],
-                        "total_bandwidth_kbps": 0
-                    }
-                    in_member_section = False
-                elif current_bundle:
+                # Member table starts on the line after the "Port ... State" header
+                member_start = block_end
+                member_header = _RE_BUNDLE_MEMBER_HEADER.search(output, header.end(), block_end)
+                if member_header:
+                    line_end = output.find('\n', member_header.end(), block_end)
+                    if line_end != -1:
+                        member_start = line_end + 1
+
+                # Bundle attributes come from the lines above the member table
+                for line in output[header.end():member_start].splitlines():
                     # Status line
                     status_match = re.search(r'Status:\s+(\S+)', line)
                     if status_match:
@@ -728,51 +790,28 @@ class CommandExecutor:
                     if bw_match:
                         current_bundle["total_bandwidth_kbps"] = int(bw_match.group(1))
 
-                    # Check for member section header (Port ... State ...)
-                    if re.search(r'Port\s+.*State', line, re.IGNORECASE):
-                        in_member_section = True
-                        continue
-
-                    # Member interface line format (IOS-XR):
-                    # Port                  Device           State        Port ID         B/W, kbps
-                    # Gi0/0/0/5             Local            Active       0x8000, 0x0002     1000000
-                    if in_member_section:
-                        # Skip separator lines (----)
-                        if line.strip().startswith('-'):
-                            continue
-                        # Skip "Link is Active" info lines
-                        if 'Link is' in line:
-                            continue
+                # Member interface line format (IOS-XR):
+                # Port                  Device           State        Port ID         B/W, kbps
+                # Gi0/0/0/5             Local            Active       0x8000, 0x0002     1000000
+                # Separator and "Link is ..." lines never match, so one finditer covers the table
+                for member_match in _RE_BUNDLE_MEMBER.finditer(output, member_start, block_end):
+                    member_state = member_match.group(3)
+                    speed_kbps = int(member_match.group(4))  # Already in kbps
+
+                    current_bundle["members"].append({
+                        "interface": member_match.group(1),
+                        "device": member_match.group(2),
+                        "speed_kbps": speed_kbps,
+                        "state": member_state
+                    })
+                    if member_state.lower() == "active":
+                        current_bundle["active_bandwidth_kbps"] += speed_kbps
 
-                        # Match: interface, device, state, port_id (0xNNNN, 0xNNNN), bandwidth(kbps)
-                        member_match = re.match(
-                            r'\s*((?:Gi|Te|Hu|GigabitEthernet|TenGigE|HundredGigE)\S*)\s+'  # Interface
-                            r'(\w+)\s+'  # Device (Local/Remote)
-                            r'(\w+)\s+'  # State (Active/Standby)
-                            r'\S+,\s+\S+\s+'  # Port ID (0x8000, 0x0002)
-                            r'(\d+)',  # Bandwidth in kbps at end
-                            line
-                        )
-                        if member_match:
-                            member_intf = member_match.group(1)
-                            member_device = member_match.group(2)
-                            member_state = member_match.group(3)
-                            speed_kbps = int(member_match.group(4))  # Already in kbps
-
-                            current_bundle["members"].append({
-                                "interface": member_intf,
-                                "device": member_device,
-                                "speed_kbps": speed_kbps,
-                                "state": member_state
-                            })
-
-            if current_bundle:
                 bundles.append(current_bundle)
 
-            # Calculate total capacity from active members for each bundle
+            # Active member bandwidth is accumulated while parsing; only classify here
             for bundle in bundles:
-                active_bw = sum(m["speed_kbps"] for m in bundle["members"] if m["state"].lower() == "active")
-                bundle["active_bandwidth_kbps"] = active_bw
+                active_bw = bundle["active_bandwidth_kbps"]
                 # Determine capacity class - show actual aggregated capacity for LAGs
                 if active_bw >= 1000000:
                     # Calculate Gbps and show as XG (e.g., 2G, 10G, 40G)
@@ -797,6 +836,31 @@ class CommandExecutor:
 
         return parsed_data
 
+    def _queue_command_audit(self, device_id: str, device_name: str, command: str,
+                             success: bool, duration_seconds: float,
+                             error_message: str = None, output_lines: int = None):
+        """Queue a command execution audit event (written by flush_audit_log)"""
+        self._audit_queue.append({
+            'timestamp': datetime.now().isoformat(),
+            'device_id': device_id,
+            'device_name': device_name,
+            'command': command,
+            'success': success,
+            'duration_seconds': duration_seconds,
+            'error_message': error_message,
+            'output_lines': output_lines
+        })
+
+    def flush_audit_log(self):
+        """Write all queued command audit events in a single bulk append"""
+        events = []
+        while True:
+            try:
+                events.append(self._audit_queue.popleft())
+            except IndexError:
+                break
+        AuditLogger.log_bulk(events)
+
     def execute_command(self, device_id: str, device_name: str, command: str) -> dict:
         """
         Execute a single command on a device
@@ -819,16 +883,19 @@ class CommandExecutor:
 
             # Execute command with dynamic timeout based on command type
             timeout = get_command_timeout(command)
-            start_time = datetime.now()
-            output = connection.send_command(command, read_timeout=timeout)
-            end_time = datetime.now()
+            with connection_manager.command_lock(device_id):
+                # Reuse the session's prompt instead of a find_prompt() round trip per command
+                expect_string = connection_manager.get_prompt_pattern(device_id)
+                start_time = datetime.now()
+                output = connection.send_command(command, read_timeout=timeout, expect_string=expect_string)
+                end_time = datetime.now()
             execution_time = (end_time - start_time).total_seconds()
 
             # Save output to file
             timestamp = start_time.strftime("%Y-%m-%d_%H-%M-%S")
             command_filename = command.replace(" ", "_").replace("/", "-")
             filename = f"{device_name}_{command_filename}_{timestamp}.txt"
-            filepath = os.path.join(self.text_output_dir, filename)
+            filepath = f"{self._text_dir_prefix}{filename}"
 
             with open(filepath, 'w') as f:
                 f.write(f"# Command: {command}\n")
@@ -855,7 +922,7 @@ class CommandExecutor:
             }
             
             json_filename = f"{device_name}_{command_filename}_{timestamp}.json"
-            json_filepath = os.path.join(self.json_output_dir, json_filename)
+            json_filepath = f"{self._json_dir_prefix}{json_filename}"
             
             with open(json_filepath, 'w') as f:
                 json.dump(json_data, f, indent=2)
@@ -864,10 +931,12 @@ class CommandExecutor:
                 os.fsync(f.fileno())
 
             logger.info(f"✅ JSON saved to {json_filename}")
+            # A same-second rerun overwrites the same names, which leaves the directory mtime alone
+            invalidate_list_cache()
 
             # Audit log: command execution success
             output_lines = len(output.split('\n')) if output else 0
-            AuditLogger.log_command_execution(
+            self._queue_command_audit(
                 device_id, device_name, command, success=True,
                 duration_seconds=execution_time, output_lines=output_lines
             )
@@ -888,7 +957,7 @@ class CommandExecutor:
         except DeviceConnectionError as e:
             logger.error(f"❌ Connection error executing '{command}' on {device_name}: {str(e)}")
             # Audit log: command execution failure
-            AuditLogger.log_command_execution(
+            self._queue_command_audit(
                 device_id, device_name, command, success=False,
                 duration_seconds=0, error_message=str(e)
             )
@@ -904,7 +973,7 @@ class CommandExecutor:
         except Exception as e:
             logger.error(f"❌ Error executing '{command}' on {device_name}: {str(e)}", exc_info=True)
             # Audit log: command execution failure
-            AuditLogger.log_command_execution(
+            self._queue_command_audit(
                 device_id, device_name, command, success=False,
                 duration_seconds=0, error_message=str(e)
             )
@@ -954,6 +1023,8 @@ class CommandExecutor:
 
             results.append(device_results)
 
+        self.flush_audit_log()
+
         return {
             'status': 'completed',
             'total_devices': len(device_list),
@@ -965,122 +1036,117 @@ class CommandExecutor:
 
     def execute_job_async(self, job_id: str, device_list: List[dict], commands: List[str] = None, batch_size: int = 10, devices_per_hour: int = 0, execution_id: str = None):
         """Background thread function to run the job with batching and rate limiting"""
-        if commands is None:
-            commands = OSPF_COMMANDS
-
-        logger.info(f"🚀 Starting async job {job_id} (execution: {execution_id}) on {len(device_list)} devices. Batch size: {batch_size}, Rate: {devices_per_hour}/hr")
-
-        # Create execution-specific CommandExecutor instance
-        executor = None
-        execution_dir = None
-        metadata_file = None
-        if execution_id:
-            # Create new executor with execution_id for isolated directory structure
-            executor = CommandExecutor(execution_id=execution_id)
-            backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            execution_dir = os.path.join(backend_dir, "data", "executions", execution_id)
-            metadata_file = os.path.join(execution_dir, "metadata.json")
-
-            # Create initial metadata
-            metadata = {
-                "execution_id": execution_id,
-                "job_id": job_id,
-                "timestamp": datetime.now().isoformat(),
-                "status": "running",
-                "devices": [{"id": d['device_id'], "name": d['device_name'], "ip": d.get('management_ip')} for d in device_list],
-                "commands": commands,
-                "total_devices": len(device_list)
-            }
-
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+        try:
+            if commands is None:
+                commands = OSPF_COMMANDS
+
+            logger.info(f"🚀 Starting async job {job_id} (execution: {execution_id}) on {len(device_list)} devices. Batch size: {batch_size}, Rate: {devices_per_hour}/hr")
+
+            # Create execution-specific CommandExecutor instance
+            executor = None
+            execution_dir = None
+            metadata_file = None
+            if execution_id:
+                # Create new executor with execution_id for isolated directory structure
+                executor = CommandExecutor(execution_id=execution_id)
+                execution_dir = os.path.join(_BACKEND_DIR, "data", "executions", execution_id)
+                metadata_file = os.path.join(execution_dir, "metadata.json")
+
+                # Create initial metadata
+                metadata = {
+                    "execution_id": execution_id,
+                    "job_id": job_id,
+                    "timestamp": datetime.now().isoformat(),
+                    "status": "running",
+                    "devices": [{"id": d['device_id'], "name": d['device_name'], "ip": d.get('management_ip')} for d in device_list],
+                    "commands": commands,
+                    "total_devices": len(device_list)
+                }
 
-            logger.info(f"📁 Created execution directory: {execution_dir}")
-        else:
-            # Use the current executor instance (legacy)
-            executor = self
-
-        # Calculate delay between batches if rate limiting is active
-        batch_delay = 0
-        if devices_per_hour > 0 and batch_size > 0:
-            # Time to process 'batch_size' devices at 'devices_per_hour' rate
-            # e.g. 10 devices at 20/hr = 0.5 hours = 1800 seconds
-            # We want to space out batches.
-            # Rate = devices / time -> time = devices / rate
-            # time_per_batch = batch_size / devices_per_hour (hours)
-            # time_per_batch_seconds = time_per_batch * 3600
-            batch_delay = (batch_size / devices_per_hour) * 3600
-            logger.info(f"⏱️ Rate limiting active: {devices_per_hour} dev/hr. Delay between batches: {batch_delay:.2f}s")
-
-        # Split into batches
-        batches = [device_list[i:i + batch_size] for i in range(0, len(device_list), batch_size)]
+                _atomic_write_json(metadata_file, metadata)
+
+                logger.info(f"📁 Created execution directory: {execution_dir}")
+            else:
+                # Use the current executor instance (legacy)
+                executor = self
+
+            # Calculate delay between batches if rate limiting is active
+            batch_delay = 0
+            if devices_per_hour > 0 and batch_size > 0:
+                # Time to process 'batch_size' devices at 'devices_per_hour' rate
+                # e.g. 10 devices at 20/hr = 0.5 hours = 1800 seconds
+                # We want to space out batches.
+                # Rate = devices / time -> time = devices / rate
+                # time_per_batch = batch_size / devices_per_hour (hours)
+                # time_per_batch_seconds = time_per_batch * 3600
+                batch_delay = (batch_size / devices_per_hour) * 3600
+                logger.info(f"⏱️ Rate limiting active: {devices_per_hour} dev/hr. Delay between batches: {batch_delay:.2f}s")
+
+            # Split into batches
+            batches = [device_list[i:i + batch_size] for i in range(0, len(device_list), batch_size)]
         
-        for batch_idx, batch in enumerate(batches):
-            # Check stop request
-            if job_manager.is_stop_requested(job_id):
-                logger.warning(f"🛑 Job {job_id} stopped by user")
-                job_manager.update_job_progress(job_id, "SYSTEM", {"status": "stopped"})
-                return
+            for batch_idx, batch in enumerate(batches):
+                # Check stop request
+                if job_manager.is_stop_requested(job_id):
+                    logger.warning(f"🛑 Job {job_id} stopped by user")
+                    job_manager.update_job_progress(job_id, "SYSTEM", {"status": "stopped"})
+                    return
 
-            logger.info(f"📦 Processing Batch {batch_idx + 1}/{len(batches)} with {len(batch)} devices")
+                logger.info(f"📦 Processing Batch {batch_idx + 1}/{len(batches)} with {len(batch)} devices")
 
-            # Process batch using the executor instance (with correct output dirs)
-            executor._process_batch(job_id, batch, commands)
+                # Process batch using the executor instance (with correct output dirs)
+                executor._process_batch(job_id, batch, commands)
             
-            # Delay before next batch (if not last batch)
-            if batch_idx < len(batches) - 1 and batch_delay > 0:
-                logger.info(f"⏳ Waiting {batch_delay:.2f}s before next batch...")
-                # Sleep in chunks to allow stopping
-                sleep_chunk = 1
-                total_slept = 0
-                while total_slept < batch_delay:
+                # Delay before next batch (if not last batch)
+                if batch_idx < len(batches) - 1 and batch_delay > 0:
+                    logger.info(f"⏳ Waiting {batch_delay:.2f}s before next batch...")
+                    # Wait on the stop event so a stop request ends the delay immediately
+                    job_manager.get_stop_event(job_id).wait(timeout=batch_delay)
                     if job_manager.is_stop_requested(job_id):
                         return
-                    time.sleep(sleep_chunk)
-                    total_slept += sleep_chunk
 
-        # After all batches complete: Update final metadata and create symlink
-        if execution_id and metadata_file:
-            job = job_manager.get_job(job_id)
-            if job:
-                # Update metadata with final results
-                metadata = {
-                    "execution_id": execution_id,
-                    "job_id": job_id,
-                    "timestamp": datetime.now().isoformat(),
-                    "start_time": job.get("start_time"),
-                    "end_time": job.get("end_time"),
-                    "status": job.get("status", "completed"),
-                    "devices": [{"id": d['device_id'], "name": d['device_name'], "ip": d.get('management_ip')} for d in device_list],
-                    "commands": commands,
-                    "results": {
-                        "total_devices": job.get("total_devices", 0),
-                        "completed_devices": job.get("completed_devices", 0),
-                        "progress_percent": job.get("progress_percent", 0)
-                    },
-                    "files": {
-                        "text_dir": os.path.join(execution_dir, "TEXT"),
-                        "json_dir": os.path.join(execution_dir, "JSON")
+            # After all batches complete: Update final metadata and create symlink
+            if execution_id and metadata_file:
+                job = job_manager.get_job(job_id)
+                if job:
+                    # Update metadata with final results
+                    metadata = {
+                        "execution_id": execution_id,
+                        "job_id": job_id,
+                        "timestamp": datetime.now().isoformat(),
+                        "start_time": job.get("start_time"),
+                        "end_time": job.get("end_time"),
+                        "status": job.get("status", "completed"),
+                        "devices": [{"id": d['device_id'], "name": d['device_name'], "ip": d.get('management_ip')} for d in device_list],
+                        "commands": commands,
+                        "results": {
+                            "total_devices": job.get("total_devices", 0),
+                            "completed_devices": job.get("completed_devices", 0),
+                            "progress_percent": job.get("progress_percent", 0)
+                        },
+                        "files": {
+                            "text_dir": os.path.join(execution_dir, "TEXT"),
+                            "json_dir": os.path.join(execution_dir, "JSON")
+                        }
                     }
-                }
 
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f, indent=2)
+                    _atomic_write_json(metadata_file, metadata)
 
-                # Update 'current' symlink to point to this execution
-                backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                current_link = os.path.join(backend_dir, "data", "current")
+                    # Update 'current' symlink to point to this execution
+                    current_link = os.path.join(_BACKEND_DIR, "data", "current")
 
-                # Remove existing symlink if it exists
-                if os.path.lexists(current_link):
-                    os.unlink(current_link)
+                    # Remove existing symlink if it exists
+                    if os.path.lexists(current_link):
+                        os.unlink(current_link)
 
-                # Create new symlink
-                os.symlink(execution_dir, current_link)
+                    # Create new symlink
+                    os.symlink(execution_dir, current_link)
 
-                logger.info(f"✅ Execution complete: {execution_id}")
-                logger.info(f"📁 Data saved to: {execution_dir}")
-                logger.info(f"🔗 Updated 'current' symlink")
+                    logger.info(f"✅ Execution complete: {execution_id}")
+                    logger.info(f"📁 Data saved to: {execution_dir}")
+                    logger.info(f"🔗 Updated 'current' symlink")
+        finally:
+            job_manager.discard_stop_event(job_id)
 
     def _process_batch(self, job_id: str, batch: List[dict], commands: List[str]):
         """Process a single batch of devices"""
@@ -1098,16 +1164,20 @@ class CommandExecutor:
             job_manager.init_device_commands(job_id, device_id, commands)
             
             device_result = {'device_id': device_id, 'device_name': device_name, 'commands': []}
+            # True once this job holds the session through its own connect()
+            held = False
 
             try:
                 # 1. LAZY CONNECTION: Connect on-demand if not already connected
-                if not connection_manager.is_connected(device_id):
+                # (with pooling, connect() checks a kept session is alive and reuses it)
+                if POOL_ENABLED or not connection_manager.is_connected(device_id):
                     logger.info(f"🔌 Connecting to {device_name} on demand...")
                     job_manager.update_device_status(job_id, device_id, "connecting")
                     
                     try:
                         # Connect with full credentials (now available in device dict)
                         connection_manager.connect(device_id, device, timeout=10)
+                        held = True
                         job_manager.update_device_status(job_id, device_id, "connected")
                         logger.info(f"✅ Connected to {device_name}")
                     except Exception as e:
@@ -1176,25 +1246,57 @@ class CommandExecutor:
                 device_result['summary'] = f"{success_count}/{len(commands)} commands success"
                 
                 job_manager.update_job_progress(job_id, device_id, device_result)
-                
-                # Disconnect after processing (as per requirement)
-                # connection_manager.disconnect(device_id) 
-                # Commented out to keep connections for now as re-connecting might be slow/complex without full credentials here
 
             except Exception as e:
                 logger.error(f"❌ Unexpected error in job {job_id} for {device_name}: {str(e)}")
                 device_result['status'] = 'error'
                 device_result['error'] = str(e)
                 job_manager.update_job_progress(job_id, device_id, device_result)
+            finally:
+                # Hand the session back so the pool janitor may reclaim it (disconnects when pooling is off)
+                try:
+                    if held:
+                        status = connection_manager.release(device_id)['status']
+                        if status in ("released", "disconnected"):
+                            job_manager.update_device_status(job_id, device_id, status)
+                except Exception as e:
+                    logger.warning(f"⚠️  Release error for {device_name}: {str(e)}")
 
         # Parallel execution within batch
         max_workers = min(10, len(batch)) if len(batch) > 0 else 1
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {executor.submit(process_device, device): device for device in batch}
-            for future in as_completed(futures):
-                pass
+            pending = set(futures)
+            stop_handled = False
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    if not future.cancelled() and future.exception():
+                        device = futures[future]
+                        logger.error(f"❌ Worker for {device.get('device_name', device['device_id'])} raised: {future.exception()}")
+
+                # On stop: cancel queued devices and drop in-flight sessions to unblock Netmiko reads
+                if pending and not stop_handled and job_manager.is_stop_requested(job_id):
+                    stop_handled = True
+                    logger.warning(f"🛑 Stop requested - cancelling {len(pending)} in-flight devices in batch")
+                    for future in pending:
+                        if future.cancel():
+                            continue
+                        device_id = futures[future]['device_id']
+                        try:
+                            # Leaves the session alone if another job still holds it
+                            connection_manager.abort(device_id)
+                        except Exception as e:
+                            logger.warning(f"⚠️  Disconnect error for {device_id} during stop: {str(e)}")
         
+        self.flush_audit_log()
+
+        # Pooled sessions were released by process_device and stay open for the next job
+        if POOL_ENABLED:
+            logger.info(f"✅ Batch complete, {len(batch)} sessions returned to the pool")
+            return
+
         # AUTO-DISCONNECT: Disconnect all devices in batch after completion
         logger.info(f"🔌 Disconnecting {len(batch)} devices from batch...")
         for device in batch:
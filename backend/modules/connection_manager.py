@@ -4,21 +4,45 @@ Uses Netmiko for robust SSH connections to Cisco routers
 Supports SSH jump host / bastion host tunneling
 """
 
+import atexit
+import collections
+import contextlib
+import functools
+import itertools
+import io
 import logging
+import logging.handlers
+import re
+import shlex
 import socket
+import string
+import tempfile
 import json
 import os
+import queue
 import threading
 import time
-from typing import Optional, Dict
-from netmiko import ConnectHandler, NetmikoTimeoutException, NetmikoAuthenticationException
-from paramiko import SSHClient, AutoAddPolicy, RSAKey
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, List, Tuple, TYPE_CHECKING
 from datetime import datetime
-from .env_config import get_router_credentials, get_jumphost_config as get_env_jumphost_config, reload_env
+from .env_config import get_env, get_router_credentials, get_jumphost_config as get_env_jumphost_config, reload_env
 from .audit_logger import AuditLogger, DeviceOperationAudit
 
+# netmiko/paramiko pull in cryptography and are slow to import; they are
+# loaded on first connect instead (see SSHConnectionManager/JumphostTunnel)
+if TYPE_CHECKING:
+    from netmiko import ConnectHandler
+    from paramiko import SSHClient
+
 logger = logging.getLogger(__name__)
 
+# Try to import orjson for faster config (de)serialization, fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Jumphost configuration file path (fallback for UI config)
 JUMPHOST_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "jumphost_config.json")
 
@@ -31,11 +55,349 @@ DEFAULT_JUMPHOST_CONFIG = {
     "password": ""
 }
 
+# Connection pool (opt-in): connect() reuses a live session until it is idle or too old (seconds).
+# Off by default so jobs keep disconnecting their devices when a batch completes
+POOL_ENABLED = get_env('CONNECTION_POOL_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+POOL_IDLE_TIMEOUT = int(get_env('CONNECTION_POOL_IDLE_TIMEOUT', '300'))
+POOL_MAX_AGE = int(get_env('CONNECTION_POOL_MAX_AGE', '3600'))
+POOL_SWEEP_INTERVAL = 30  # Seconds between janitor sweeps of idle/expired sessions
+# Seconds connect() waits to health-check an idle pooled session that is mid-command before failing
+POOL_BUSY_WAIT = int(get_env('CONNECTION_POOL_BUSY_WAIT', '15'))
+# Upper bound on pooled sessions; the least recently used one is disconnected beyond it
+MAX_POOL_SIZE = int(get_env('CONNECTION_POOL_MAX_SIZE', '100'))
+
+# Import Netmiko (and its Cisco drivers) in the background at startup so the
+# first connect does not pay for it, while keeping module import fast
+PRELOAD_NETMIKO = get_env('SSH_PRELOAD_DRIVERS', 'true').lower() in ('1', 'true', 'yes')
+PRELOAD_DEVICE_TYPES = ('cisco_ios', 'cisco_xr', 'cisco_nxos')
+
+# After a failed connect, fail fast for this long instead of waiting out another timeout (0 = off)
+CONNECT_FAILURE_COOLDOWN = int(get_env('SSH_CONNECT_FAILURE_COOLDOWN', '30'))
+
+# Close the shared jumphost transport once no device channel has used it for this long (0 = never)
+JUMPHOST_IDLE_TIMEOUT = int(get_env('JUMPHOST_IDLE_TIMEOUT', '300'))
+
+# Transport-level keepalive for the jumphost, plus an application probe while
+# device channels are open, so a silently dropped tunnel is noticed early (seconds)
+JUMPHOST_KEEPALIVE_INTERVAL = int(get_env('JUMPHOST_KEEPALIVE_INTERVAL', '30'))
+JUMPHOST_PROBE_INTERVAL = int(get_env('JUMPHOST_PROBE_INTERVAL', '60'))
+
+# How device sessions reach the jumphost: 'paramiko' (direct-tcpip channels over
+# JumphostTunnel) or 'openssh' (system ssh -W with ControlMaster multiplexing).
+# openssh mode runs ssh in BatchMode, so it needs key-based auth to the jumphost.
+JUMPHOST_MODE = get_env('JUMPHOST_MODE', 'paramiko').lower()
+JUMPHOST_CONTROL_PATH = get_env(
+    'JUMPHOST_CONTROL_PATH', os.path.join(tempfile.gettempdir(), 'ospf-jumphost-%r@%h:%p')
+)
+JUMPHOST_CONTROL_PERSIST = get_env('JUMPHOST_CONTROL_PERSIST', '60s')
+
+# Optional cap on device channels multiplexed over the one jumphost transport
+# (0 = unlimited). OpenSSH MaxSessions does not limit direct-tcpip channels, so
+# only set this for a jumphost with its own channel limit.
+JUMPHOST_MAX_CHANNELS = max(0, int(get_env('JUMPHOST_MAX_CHANNELS', '0')))
+JUMPHOST_BATCH_OPEN_WORKERS = 32  # Max threads opening channels in one batch
+
+# Throttle for new jumphost logins and channel opens (per second, with burst),
+# so a reconnect storm does not trip sshd MaxStartups
+JUMPHOST_CONNECT_RATE = float(get_env('JUMPHOST_CONNECT_RATE', '5'))
+JUMPHOST_CONNECT_BURST = int(get_env('JUMPHOST_CONNECT_BURST', '10'))
+# Retries with exponential backoff when the jumphost refuses a channel for lack of sessions
+CHANNEL_OPEN_RETRIES = 3
+CHANNEL_OPEN_BACKOFF = 0.5  # Seconds before the first retry, doubled each time
+
+# Netmiko session transcripts are opt-in (SESSION_LOG=1); all devices share one rotating file
+SESSION_LOG_ENABLED = get_env('SESSION_LOG', '0').lower() in ('1', 'true', 'yes')
+SESSION_LOG_DIR = "logs"
+SESSION_LOG_FILE = os.path.join(SESSION_LOG_DIR, "sessions.log")
+SESSION_LOG_MAX_BYTES = int(get_env('SESSION_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+SESSION_LOG_BACKUP_COUNT = int(get_env('SESSION_LOG_BACKUP_COUNT', '5'))
+
+# Audit events queued for the background writer; beyond this the oldest are dropped
+AUDIT_QUEUE_MAX = int(get_env('AUDIT_QUEUE_MAX', '10000'))
+
+# Parsed jumphost_config.json as (stat key, merged config), re-read only when the file changes
+_jumphost_json_cache: Tuple[Optional[Tuple[int, int]], Optional[Dict]] = (None, None)
+_jumphost_json_lock = threading.Lock()  # One reader refills the cache; others wait and reuse it
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_device_type(software: str, platform: str) -> str:
+    """Map a device's software/platform strings to a Netmiko device_type (memoized)"""
+    software = software.upper()
+    platform = platform.upper()
+
+    if 'XR' in software or 'ASR9' in platform:
+        return 'cisco_xr'
+    if 'NX' in software or 'NEXUS' in platform:
+        return 'cisco_nxos'
+    return 'cisco_ios'  # Default (also IOS-XE)
+
+
 class DeviceConnectionError(Exception):
     """Custom exception for device connection errors"""
     pass
 
 
+class DeviceUnreachableError(DeviceConnectionError):
+    """The target refused or did not answer the TCP connect; trips the connect circuit breaker"""
+    pass
+
+
+class _TokenBucket:
+    """Thread-safe token bucket: acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return  # Throttling disabled
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self.rate)
+
+
+_CONNECT_BUCKET = _TokenBucket(JUMPHOST_CONNECT_RATE, JUMPHOST_CONNECT_BURST)
+
+
+class _SessionLogStream(io.BufferedIOBase):
+    """File-like session_log handed to Netmiko; forwards each flushed chunk to the shared sink"""
+
+    def __init__(self, sink_logger: logging.Logger, device_id: str):
+        super().__init__()
+        self._logger = sink_logger
+        self._device_id = device_id
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            self._logger.info(bytes(data).decode('utf-8', 'replace'), extra={'device_id': self._device_id})
+        return len(data)
+
+
+class SessionLogMultiplexer:
+    """
+    Single rotating sink for every device's Netmiko session transcript
+
+    Each device gets a stream() whose writes become log records on a queue;
+    one QueueListener thread drains it into a RotatingFileHandler, so
+    sessions hold no file descriptors and never wait on disk writes.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._logger = logging.getLogger(f"{__name__}.session_log")
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Open the log file and start the writer thread on first use"""
+        with self._lock:
+            if self._listener is not None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s [%(device_id)s] %(message)s"))
+            records = queue.SimpleQueue()
+            self._logger.addHandler(logging.handlers.QueueHandler(records))
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._listener = logging.handlers.QueueListener(records, handler)
+            self._listener.start()
+            atexit.register(self.stop)
+
+    def stream(self, device_id: str) -> _SessionLogStream:
+        """Get a Netmiko session_log stream that tags everything it writes with device_id"""
+        if self._listener is None:
+            self._start()
+        return _SessionLogStream(self._logger, device_id)
+
+    def stop(self):
+        """Flush queued records and stop the writer thread"""
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener = None
+
+
+_SESSION_LOGS = SessionLogMultiplexer(SESSION_LOG_FILE, SESSION_LOG_MAX_BYTES, SESSION_LOG_BACKUP_COUNT)
+
+
+class AuditDispatcher:
+    """
+    Runs AuditLogger calls on a background thread instead of inside connect()
+
+    submit() only appends a bound call to a deque (atomic, no lock) and wakes
+    the writer thread, which makes the real AuditLogger calls and their file
+    appends. When more than max_pending calls are waiting the oldest are
+    dropped, and stop() runs whatever is still queued at shutdown.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._pending: collections.deque = collections.deque()
+        self._wakeup = threading.Event()
+        self._dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Start the writer thread on first use"""
+        with self._lock:
+            if self._thread is not None or self._stopping:
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) for the writer thread; runs inline once stopped"""
+        if self._stopping:
+            func(*args, **kwargs)
+            return
+        if self._thread is None:
+            self._start()
+        if len(self._pending) >= self.max_pending:
+            try:
+                self._pending.popleft()
+                self._dropped += 1
+            except IndexError:
+                pass
+        self._pending.append(functools.partial(func, *args, **kwargs))
+        self._wakeup.set()
+
+    def _drain(self):
+        """Run every queued call, oldest first"""
+        if self._dropped:
+            dropped, self._dropped = self._dropped, 0
+            logger.warning("⚠️ Audit queue full: dropped %d oldest event(s)", dropped)
+        while True:
+            try:
+                call = self._pending.popleft()
+            except IndexError:
+                return
+            try:
+                call()
+            except Exception as e:
+                logger.error(f"❌ Audit log write failed: {e}")
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._drain()
+
+    def stop(self):
+        """Stop the writer thread and flush whatever is still queued"""
+        with self._lock:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._wakeup.set()
+            thread.join(timeout=5)
+        self._drain()
+
+
+_AUDIT = AuditDispatcher(AUDIT_QUEUE_MAX)
+
+
+def _openssh_proxy(jumphost_config: Dict, host: str, port: int):
+    """
+    Socket for a device reached through the jumphost by the system ssh client
+
+    Runs `ssh -W host:port` against the jumphost with ControlMaster=auto, so
+    the first device opens a master connection and the rest multiplex over
+    it. Returned as a paramiko ProxyCommand, which Netmiko takes as `sock`.
+    """
+    from paramiko import ProxyCommand
+
+    argv = [
+        'ssh',
+        '-o', 'BatchMode=yes',
+        '-o', 'StrictHostKeyChecking=accept-new',
+        '-o', 'ControlMaster=auto',
+        '-o', f'ControlPath={JUMPHOST_CONTROL_PATH}',
+        '-o', f'ControlPersist={JUMPHOST_CONTROL_PERSIST}',
+        '-p', str(jumphost_config.get('port', 22)),
+        '-W', f'{host}:{port}',
+        f"{jumphost_config['username']}@{jumphost_config['host']}",
+    ]
+    return ProxyCommand(shlex.join(argv))
+
+
+def _open_tcp_socket(host: str, port: int, timeout: float) -> socket.socket:
+    """Open a TCP socket for SSH with Nagle disabled and keepalive on, before the handshake"""
+    try:
+        sock = socket.create_connection((host, port), timeout=timeout)
+    except OSError as e:
+        raise DeviceUnreachableError(f"TCP connection to {host}:{port} failed: {e}")
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+
+def _load_jumphost_json() -> Optional[Dict]:
+    """
+    Return the merged config from JUMPHOST_CONFIG_FILE, or None if the file is
+    missing or holds no usable config. Parsed once per (mtime, size) of the file.
+    """
+    global _jumphost_json_cache
+
+    try:
+        st = os.stat(JUMPHOST_CONFIG_FILE)
+    except FileNotFoundError:
+        return None
+
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached_key, cached_config = _jumphost_json_cache
+    if cached_key == stat_key:
+        return cached_config
+
+    with _jumphost_json_lock:
+        # Another thread may have re-read the file while we waited
+        cached_key, cached_config = _jumphost_json_cache
+        if cached_key == stat_key:
+            return cached_config
+
+        if ORJSON_AVAILABLE:
+            with open(JUMPHOST_CONFIG_FILE, 'rb') as f:
+                config = orjson.loads(f.read())
+        else:
+            with open(JUMPHOST_CONFIG_FILE, 'r') as f:
+                config = json.load(f)
+
+        merged = None
+        # If JSON has a valid config (host is set or explicitly enabled/disabled), use it
+        if isinstance(config, dict) and (config.get('host') or 'enabled' in config):
+            merged = {**DEFAULT_JUMPHOST_CONFIG, **config}
+
+        _jumphost_json_cache = (stat_key, merged)
+        return merged
+
+
+def invalidate_jumphost_config_cache():
+    """Drop the cached jumphost_config.json contents"""
+    global _jumphost_json_cache
+    _jumphost_json_cache = (None, None)
+
+
 def load_jumphost_config() -> Dict:
     """
     Load jumphost configuration - PRIORITY ORDER:
@@ -46,15 +408,12 @@ def load_jumphost_config() -> Dict:
     """
     # PRIMARY: Check JSON file first (UI saves here)
     try:
-        if os.path.exists(JUMPHOST_CONFIG_FILE):
-            with open(JUMPHOST_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                # If JSON has a valid config (host is set or explicitly enabled/disabled), use it
-                if config.get('host') or 'enabled' in config:
-                    merged = {**DEFAULT_JUMPHOST_CONFIG, **config}
-                    logger.debug(f"Using jumphost config from JSON: enabled={merged.get('enabled')}, host={merged.get('host')}")
-                    return merged
-    except Exception as e:
+        merged = _load_jumphost_json()
+        if merged is not None:
+            logger.debug(f"Using jumphost config from JSON: enabled={merged.get('enabled')}, host={merged.get('host')}")
+            # Copy so callers cannot mutate the cached config
+            return dict(merged)
+    except (OSError, ValueError) as e:  # ValueError covers json/orjson decode errors
         logger.warning(f"Failed to load jumphost JSON config: {e}")
 
     # FALLBACK: Check .env.local only if JSON doesn't exist or has no config
@@ -71,14 +430,34 @@ def load_jumphost_config() -> Dict:
 def save_jumphost_config(config: Dict) -> bool:
     """Save jumphost configuration to file and invalidate any cached tunnel"""
     try:
-        with open(JUMPHOST_CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Write a temp file in the same dir and rename it over the config, so
+        # readers never see a truncated file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(JUMPHOST_CONFIG_FILE)),
+                                        prefix=".jumphost_config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                if ORJSON_AVAILABLE:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2).decode())
+                else:
+                    json.dump(config, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, JUMPHOST_CONFIG_FILE)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        invalidate_jumphost_config_cache()
         logger.info(f"Jumphost config saved: enabled={config.get('enabled')}, host={config.get('host')}")
 
         # IMPORTANT: Close existing tunnel so next connection uses new config
         # This ensures UI changes take effect immediately
         # Note: connection_manager is defined at module level below, access via globals()
         global connection_manager
+        if 'connection_manager' in globals() and connection_manager:
+            connection_manager._jumphost_enabled = None
+            # Targets that were unreachable over the old route may be reachable over the new one
+            connection_manager.clear_recent_failures()
         if 'connection_manager' in globals() and connection_manager and connection_manager.jumphost_tunnel:
             logger.info("Closing existing jumphost tunnel due to config change...")
             connection_manager.close_jumphost_tunnel()
@@ -92,20 +471,34 @@ def save_jumphost_config(config: Dict) -> bool:
 class JumphostTunnel:
     """Manages SSH tunnel through a jumphost/bastion server"""
 
+    _paramiko = None  # (SSHClient, AutoAddPolicy), imported on first connect
+
     def __init__(self, jumphost_config: Dict):
         self.config = jumphost_config
-        self.ssh_client: Optional[SSHClient] = None
+        self.ssh_client: Optional['SSHClient'] = None
         self.transport = None
         self.connect_time: Optional[datetime] = None
+        # Channel slots only exist when JUMPHOST_MAX_CHANNELS caps the open channels
+        self._channel_slots = (threading.BoundedSemaphore(JUMPHOST_MAX_CHANNELS)
+                               if JUMPHOST_MAX_CHANNELS else None)
+        self._open_channels = set()
+        self._channels_lock = threading.Lock()
 
     def connect(self) -> bool:
         """Establish connection to the jumphost"""
         try:
-            self.ssh_client = SSHClient()
-            self.ssh_client.set_missing_host_key_policy(AutoAddPolicy())
+            if JumphostTunnel._paramiko is None:
+                from paramiko import SSHClient, AutoAddPolicy
+                JumphostTunnel._paramiko = (SSHClient, AutoAddPolicy)
+            ssh_client_cls, auto_add_policy_cls = JumphostTunnel._paramiko
+
+            self.ssh_client = ssh_client_cls()
+            self.ssh_client.set_missing_host_key_policy(auto_add_policy_cls())
 
-            logger.info(f"🔌 Connecting to jumphost {self.config['host']}:{self.config['port']}...")
+            _CONNECT_BUCKET.acquire()
+            logger.info("🔌 Connecting to jumphost %s:%s...", self.config['host'], self.config['port'])
 
+            sock = _open_tcp_socket(self.config['host'], self.config.get('port', 22), 30)
             self.ssh_client.connect(
                 hostname=self.config['host'],
                 port=self.config.get('port', 22),
@@ -113,15 +506,18 @@ class JumphostTunnel:
                 password=self.config['password'],
                 timeout=30,
                 allow_agent=False,
-                look_for_keys=False
+                look_for_keys=False,
+                sock=sock
             )
 
             self.transport = self.ssh_client.get_transport()
+            if JUMPHOST_KEEPALIVE_INTERVAL > 0:
+                self.transport.set_keepalive(JUMPHOST_KEEPALIVE_INTERVAL)
             self.connect_time = datetime.now()
-            logger.info(f"✅ Connected to jumphost {self.config['host']}")
+            logger.info("✅ Connected to jumphost %s", self.config['host'])
 
             # Audit log: jumphost connection success
-            AuditLogger.log_jumphost_connect(
+            _AUDIT.submit(AuditLogger.log_jumphost_connect,
                 self.config['host'], self.config.get('port', 22),
                 self.config['username'], success=True
             )
@@ -130,37 +526,154 @@ class JumphostTunnel:
         except Exception as e:
             logger.error(f"❌ Failed to connect to jumphost: {e}")
             # Audit log: jumphost connection failure
-            AuditLogger.log_jumphost_connect(
+            _AUDIT.submit(AuditLogger.log_jumphost_connect,
                 self.config['host'], self.config.get('port', 22),
                 self.config['username'], success=False, error_message=str(e)
             )
             self.close()
             raise DeviceConnectionError(f"Jumphost connection failed: {e}")
 
+    def is_healthy(self) -> bool:
+        """Cheap check for the connect() hot path: the transport is up (no network I/O)"""
+        return self.transport is not None and self.transport.is_active()
+
+    def probe(self) -> bool:
+        """
+        Write to the transport to find out it died since the last check
+
+        A write into a half-open connection still lands in the socket buffer,
+        so this only catches a connection the kernel already knows is gone.
+        Half-open tunnels are found by the transport keepalive and TCP
+        keepalive, which eventually mark the transport inactive. Run it from
+        the rate-limited probe thread, not per connect.
+        """
+        if not self.is_healthy():
+            return False
+        try:
+            self.transport.send_ignore()
+            return True
+        except Exception:
+            return False
+
     def create_channel(self, target_host: str, target_port: int = 22) -> socket.socket:
-        """Create a tunnel channel to the target device through the jumphost"""
+        """
+        Create a tunnel channel to the target device through the jumphost
+
+        Safe to call from several threads at once: paramiko's Transport
+        multiplexes the channel opens. When JUMPHOST_MAX_CHANNELS is set, a
+        channel over the cap fails at once rather than waiting for a slot.
+        Release the channel with release_channel().
+        """
         if not self.transport:
             raise DeviceConnectionError("Jumphost not connected")
 
+        slots = self._channel_slots
+        if slots is not None and not slots.acquire(blocking=False):
+            raise DeviceConnectionError(
+                f"Tunnel creation failed: all {JUMPHOST_MAX_CHANNELS} jumphost channels are in use "
+                f"(raise JUMPHOST_MAX_CHANNELS or disconnect idle devices)"
+            )
+
         try:
-            logger.info(f"🔗 Creating tunnel to {target_host}:{target_port} via jumphost...")
+            logger.info("🔗 Creating tunnel to %s:%s via jumphost...", target_host, target_port)
 
             # Create a direct-tcpip channel (SSH tunnel)
-            channel = self.transport.open_channel(
-                "direct-tcpip",
-                (target_host, target_port),
-                ("127.0.0.1", 0)
-            )
+            channel = self._open_direct_tcpip(target_host, target_port)
 
             if channel is None:
                 raise DeviceConnectionError(f"Failed to create tunnel to {target_host}")
 
-            logger.info(f"✅ Tunnel established to {target_host}:{target_port}")
+            with self._channels_lock:
+                self._open_channels.add(channel)
+            logger.info("✅ Tunnel established to %s:%s", target_host, target_port)
             return channel
 
         except Exception as e:
+            if slots is not None:
+                slots.release()
             logger.error(f"❌ Failed to create tunnel to {target_host}: {e}")
-            raise DeviceConnectionError(f"Tunnel creation failed: {e}")
+            error_cls = DeviceUnreachableError if isinstance(e, DeviceUnreachableError) else DeviceConnectionError
+            raise error_cls(f"Tunnel creation failed: {e}")
+
+    def create_channels_batch(self, targets: List[Tuple[str, int]]) -> List[socket.socket]:
+        """
+        Open channels to several devices at once, in about one round trip
+
+        paramiko has no public non-blocking channel open, so each open runs
+        on its own thread; the Transport sends every CHANNEL_OPEN before any
+        confirmation comes back. Targets whose parallel open failed get one
+        serial retry before the whole batch is released and the error raised.
+
+        Args:
+            targets: (host, port) pairs
+
+        Returns:
+            Channels in the same order as targets
+        """
+        if not targets:
+            return []
+
+        channels: List[Optional[socket.socket]] = [None] * len(targets)
+        workers = min(len(targets), JUMPHOST_MAX_CHANNELS or JUMPHOST_BATCH_OPEN_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="channel-open") as executor:
+            futures = {executor.submit(self.create_channel, host, port): i
+                       for i, (host, port) in enumerate(targets)}
+            for future in as_completed(futures):
+                try:
+                    channels[futures[future]] = future.result()
+                except DeviceConnectionError:
+                    pass
+
+        try:
+            for i, (host, port) in enumerate(targets):
+                if channels[i] is None:
+                    channels[i] = self.create_channel(host, port)
+        except DeviceConnectionError:
+            for channel in channels:
+                if channel is not None:
+                    self.release_channel(channel)
+            raise
+        return channels
+
+    def _open_direct_tcpip(self, target_host: str, target_port: int):
+        """Open a direct-tcpip channel (throttled), backing off while the jumphost is out of sessions"""
+        from paramiko import ChannelException
+        from paramiko.common import (OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED, OPEN_FAILED_CONNECT_FAILED,
+                                     OPEN_FAILED_RESOURCE_SHORTAGE)
+
+        delay = CHANNEL_OPEN_BACKOFF
+        for attempt in range(CHANNEL_OPEN_RETRIES + 1):
+            _CONNECT_BUCKET.acquire()
+            try:
+                return self.transport.open_channel(
+                    "direct-tcpip",
+                    (target_host, target_port),
+                    ("127.0.0.1", 0)
+                )
+            except ChannelException as e:
+                if e.code == OPEN_FAILED_CONNECT_FAILED:
+                    # The jumphost reached out but the target did not answer
+                    raise DeviceUnreachableError(f"{target_host}:{target_port} unreachable from jumphost: {e.text}")
+                # sshd answers a session-limit hit with "prohibited"/"resource shortage"
+                if attempt == CHANNEL_OPEN_RETRIES or e.code not in (
+                        OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED, OPEN_FAILED_RESOURCE_SHORTAGE):
+                    raise
+                logger.warning("⚠️  Jumphost refused channel to %s (%s), retrying in %.1fs",
+                               target_host, e.text, delay)
+                time.sleep(delay)
+                delay *= 2
+
+    def release_channel(self, channel):
+        """Close a channel from create_channel() and free its slot"""
+        with self._channels_lock:
+            owned = channel in self._open_channels
+            self._open_channels.discard(channel)
+        try:
+            channel.close()
+        except Exception:
+            pass
+        if owned and self._channel_slots is not None:
+            self._channel_slots.release()
 
     def close(self):
         """Close the jumphost connection"""
@@ -168,7 +681,7 @@ class JumphostTunnel:
             # Audit log: jumphost disconnection with session duration
             if self.connect_time:
                 duration = (datetime.now() - self.connect_time).total_seconds()
-                AuditLogger.log_jumphost_disconnect(self.config['host'], duration)
+                _AUDIT.submit(AuditLogger.log_jumphost_disconnect, self.config['host'], duration)
 
             try:
                 self.ssh_client.close()
@@ -178,89 +691,171 @@ class JumphostTunnel:
             self.transport = None
             self.connect_time = None
 
-class MockConnection:
-    """Mock connection for development/demo purposes when real devices are unreachable"""
-    def __init__(self, hostname, ip_address):
-        self.hostname = hostname
-        self.ip_address = ip_address
-        
-    def find_prompt(self):
-        return f"{self.hostname}#"
-        
-    def send_command(self, command, **kwargs):
-        logger.info(f"🔮 Mock execution: {command} on {self.hostname}")
-        
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if "show process cpu" in command:
-            return f"""
+        # Channels die with the transport; hand their slots back to the same
+        # semaphore so a later release_channel() on one of them is a no-op
+        with self._channels_lock:
+            dropped = len(self._open_channels)
+            self._open_channels.clear()
+        if self._channel_slots is not None:
+            for _ in range(dropped):
+                self._channel_slots.release()
+
+# Canned MockConnection outputs, built once at import. Only the OSPF database
+# output depends on the device; it is a string.Template rendered once per MockConnection.
+_MOCK_CPU_OUTPUT = """
 CPU utilization for five seconds: 8%/0%; one minute: 8%; five minutes: 7%
  PID Runtime(ms)     Invoked      uSecs   5Sec   1Min   5Min TTY Process 
   88     1234567     1234567       1000  0.00%  0.00%  0.00%   0 Check heaps
 """
-        elif "show process memory" in command:
-            return f"""
+
+_MOCK_MEMORY_OUTPUT = """
 Processor Pool Total: 1000000000 Used: 200000000 Free: 800000000
 """
-        elif "show route connected" in command:
-            return f"""
+
+_MOCK_ROUTE_CONNECTED_OUTPUT = """
 C    192.168.1.0/24 is directly connected, GigabitEthernet1
 C    10.0.0.0/8 is directly connected, GigabitEthernet2
 """
-        elif "show route ospf" in command:
-            return f"""
+
+_MOCK_ROUTE_OSPF_OUTPUT = """
 O    172.16.0.0/24 [110/2] via 10.0.0.2, 00:00:12, GigabitEthernet2
 """
-        elif "show ospf database" in command:
-            return f"""
-            OSPF Router with ID ({self.ip_address}) (Process ID 1)
+
+_MOCK_OSPF_DATABASE_TEMPLATE = string.Template("""
+            OSPF Router with ID ($ip) (Process ID 1)
 
                 Router Link States (Area 0)
 
 Link ID         ADV Router      Age         Seq#       Checksum Link count
-{self.ip_address}     {self.ip_address}     100         0x80000001 0x0000   2
-"""
-        elif "show ip ospf neighbor" in command:
-            return f"""
+$ip     $ip     100         0x80000001 0x0000   2
+""")
+
+_MOCK_OSPF_NEIGHBOR_OUTPUT = """
 Neighbor ID     Pri   State           Dead Time   Address         Interface
 172.16.1.1      1     FULL/DR         00:00:35    172.13.0.1      GigabitEthernet0/0/0/0
 172.16.2.2      1     FULL/BDR        00:00:38    172.13.0.2      GigabitEthernet0/0/0/1
 """
-        elif "show cdp neighbor" in command:
-            return f"""
+
+_MOCK_CDP_NEIGHBOR_OUTPUT = """
 Capability Codes: R - Router, T - Trans Bridge, B - Source Route Bridge
                   S - Switch, H - Host, I - IGMP, r - Repeater
 
 Device ID        Local Intrfce     Holdtme    Capability  Platform  Port ID
 neighbor-r1      Gig 0/1           120          R S I     ASR9K     Gig 0/2
 """
+
+# (substring, response, True if the response is the per-device OSPF database) in match-priority order
+_MOCK_RESPONSES = (
+    ("show process cpu", _MOCK_CPU_OUTPUT, False),
+    ("show process memory", _MOCK_MEMORY_OUTPUT, False),
+    ("show route connected", _MOCK_ROUTE_CONNECTED_OUTPUT, False),
+    ("show route ospf", _MOCK_ROUTE_OSPF_OUTPUT, False),
+    ("show ospf database", _MOCK_OSPF_DATABASE_TEMPLATE, True),
+    ("show ip ospf neighbor", _MOCK_OSPF_NEIGHBOR_OUTPUT, False),
+    ("show cdp neighbor", _MOCK_CDP_NEIGHBOR_OUTPUT, False),
+)
+# One alternation scan instead of a chain of substring checks; group N maps to _MOCK_RESPONSES[N - 1]
+_MOCK_PATTERN = re.compile("|".join(f"({re.escape(needle)})" for needle, _, _ in _MOCK_RESPONSES))
+
+
+class MockConnection:
+    """Mock connection for development/demo purposes when real devices are unreachable"""
+    def __init__(self, hostname, ip_address):
+        self.hostname = hostname
+        self.ip_address = ip_address
+        # The only device-specific response; the IP never changes, so render it once
+        self._ospf_database_output = _MOCK_OSPF_DATABASE_TEMPLATE.substitute(ip=ip_address)
+        
+    def find_prompt(self):
+        return f"{self.hostname}#"
         
+    def send_command(self, command, **kwargs):
+        logger.info("🔮 Mock execution: %s on %s", command, self.hostname)
+
+        match = _MOCK_PATTERN.search(command)
+        if match:
+            _, response, templated = _MOCK_RESPONSES[match.lastindex - 1]
+            return self._ospf_database_output if templated else response
+
         return f"Mock output for '{command}' from {self.hostname}"
         
     def disconnect(self):
         pass
 
+class DeviceSession:
+    """Everything tracked for one open device session, kept in a single slotted record"""
+    __slots__ = ('conn', 'channel', 'created', 'last_used', 'holders', 'lock', 'pool_key', 'prompt_pattern',
+                 'session_log')
+
+    def __init__(self, conn, channel=None, pool_key: Optional[tuple] = None,
+                 prompt_pattern: Optional[str] = None, session_log: Optional[io.BufferedIOBase] = None):
+        now = time.monotonic()
+        self.conn = conn
+        self.channel = channel  # Jumphost channel backing the session (None for direct)
+        self.created = now
+        self.last_used = now
+        # Callers that got this session from connect() and have not release()d it yet;
+        # changed under the manager's _connections_lock, never evicted while non-zero
+        self.holders = 1
+        # Held while the Netmiko connection is talking to the device; it is not thread-safe
+        self.lock = threading.Lock()
+        self.pool_key = pool_key
+        # Escaped prompt regex, passed as expect_string so Netmiko
+        # does not re-run find_prompt() before every command
+        self.prompt_pattern = prompt_pattern
+        self.session_log = session_log  # Only set when SESSION_LOG is enabled
+
+    @property
+    def in_use(self) -> bool:
+        return self.holders > 0
+
+
 class SSHConnectionManager:
     """Manages SSH connections to network devices using Netmiko with optional jumphost support"""
 
+    _ConnectHandler = None  # netmiko.ConnectHandler, imported on first connect
+
     def __init__(self):
-        self.active_connections: Dict[str, ConnectHandler] = {}
+        # Kept in LRU order: most recently used session last
+        self.sessions: 'collections.OrderedDict[str, DeviceSession]' = collections.OrderedDict()
         self.jumphost_tunnel: Optional[JumphostTunnel] = None
-        self.device_channels: Dict[str, any] = {}  # Track channels per device for cleanup
         self._jumphost_lock = threading.Lock()  # Thread-safe jumphost access
+        self._connections_lock = threading.Lock()  # Guards sessions/_pending_channels
+        # Jumphost channels opened by connect() calls that have not registered a session yet
+        self._pending_channels = 0
+        # (ip, port) -> monotonic time of the last connect that found the target unreachable
+        self._recent_failures: Dict[Tuple[str, int], float] = {}
+        self._pool_janitor: Optional[threading.Thread] = None
+        self._jumphost_idle_timer: Optional[threading.Timer] = None
+        self._jumphost_probe_thread: Optional[threading.Thread] = None
+        # Last seen jumphost 'enabled' flag (None = unknown); reset by save_jumphost_config()
+        self._jumphost_enabled: Optional[bool] = None
+        if PRELOAD_NETMIKO:
+            threading.Thread(target=self._preload_drivers, name="netmiko-preload", daemon=True).start()
         logger.info("SSHConnectionManager initialized")
 
-    def _ensure_jumphost_connected(self) -> Optional[JumphostTunnel]:
+    def _ensure_jumphost_connected(self, jumphost_config: Optional[Dict] = None) -> Optional[JumphostTunnel]:
         """Ensure jumphost is connected if enabled, return tunnel or None (thread-safe)"""
-        jumphost_config = load_jumphost_config()
+        if jumphost_config is None:
+            # Fast path: jumphost known to be disabled, skip reloading the config
+            if self._jumphost_enabled is False:
+                return None
+            jumphost_config = load_jumphost_config()
 
-        if not jumphost_config.get('enabled', False):
+        self._jumphost_enabled = bool(jumphost_config.get('enabled', False))
+        if not self._jumphost_enabled:
             return None
 
+        # Lock-free fast path: read the tunnel reference once and reuse it if healthy,
+        # so parallel connects through a live tunnel do not serialize on the lock
+        tunnel = self.jumphost_tunnel
+        if tunnel is not None and tunnel.is_healthy():
+            return tunnel
+
         with self._jumphost_lock:
-            # Reuse existing tunnel if still valid
+            # Re-check under the lock: another thread may have reconnected already
             if self.jumphost_tunnel and self.jumphost_tunnel.transport:
-                if self.jumphost_tunnel.transport.is_active():
+                if self.jumphost_tunnel.is_healthy():
                     return self.jumphost_tunnel
                 else:
                     logger.warning("Jumphost tunnel expired, reconnecting...")
@@ -271,7 +866,228 @@ class SSHConnectionManager:
             self.jumphost_tunnel.connect()
             return self.jumphost_tunnel
 
-    def connect(self, device_id: str, device_info: dict, timeout: int = 5) -> dict:
+    def _jumphost_in_use(self) -> bool:
+        """True while any session or in-flight connect holds a jumphost channel (caller holds _connections_lock)"""
+        return self._pending_channels > 0 or any(
+            session.channel is not None for session in self.sessions.values()
+        )
+
+    def _schedule_jumphost_idle_close(self):
+        """Arm the idle timer for the shared jumphost transport once its last channel is gone"""
+        if JUMPHOST_IDLE_TIMEOUT <= 0:
+            return
+        with self._jumphost_lock:
+            if self.jumphost_tunnel is None:
+                return
+            with self._connections_lock:
+                if self._jumphost_in_use():
+                    return
+            if self._jumphost_idle_timer is not None:
+                self._jumphost_idle_timer.cancel()
+            timer = threading.Timer(JUMPHOST_IDLE_TIMEOUT, self._close_idle_jumphost)
+            timer.daemon = True
+            timer.start()
+            self._jumphost_idle_timer = timer
+
+    def _close_idle_jumphost(self):
+        """Timer callback: close the jumphost transport if it is still unused"""
+        with self._jumphost_lock:
+            self._jumphost_idle_timer = None
+            with self._connections_lock:
+                if self._jumphost_in_use():
+                    return
+            if self.jumphost_tunnel is not None:
+                logger.info(f"🔌 Closing jumphost tunnel after {JUMPHOST_IDLE_TIMEOUT}s without device channels")
+                self.jumphost_tunnel.close()
+                self.jumphost_tunnel = None
+
+    def _start_jumphost_probe(self):
+        """Start the background jumphost probe unless one is already running (caller holds _jumphost_lock)"""
+        if JUMPHOST_PROBE_INTERVAL <= 0:
+            return
+        if self._jumphost_probe_thread is not None and self._jumphost_probe_thread.is_alive():
+            return
+        self._jumphost_probe_thread = threading.Thread(
+            target=self._probe_jumphost, name="jumphost-probe", daemon=True
+        )
+        self._jumphost_probe_thread.start()
+
+    def _probe_jumphost(self):
+        """Probe the jumphost while device channels use it; close it as soon as it turns out dead"""
+        while True:
+            time.sleep(JUMPHOST_PROBE_INTERVAL)
+            with self._jumphost_lock:
+                tunnel = self.jumphost_tunnel
+                with self._connections_lock:
+                    in_use = self._jumphost_in_use()
+                if tunnel is None or not in_use:
+                    self._jumphost_probe_thread = None
+                    return
+                if not tunnel.probe():
+                    logger.warning("⚠️  Jumphost tunnel is not responding, closing it so the next connect reconnects")
+                    tunnel.close()
+                    self.jumphost_tunnel = None
+                    self._jumphost_probe_thread = None
+                    return
+
+    @classmethod
+    def _connect_handler(cls):
+        """Return netmiko.ConnectHandler, importing Netmiko the first time it is needed"""
+        if cls._ConnectHandler is None:
+            from netmiko import ConnectHandler
+            cls._ConnectHandler = ConnectHandler
+        return cls._ConnectHandler
+
+    @classmethod
+    def _preload_drivers(cls):
+        """Warm Netmiko's dispatcher and the driver classes this app uses (runs off the import path)"""
+        try:
+            cls._connect_handler()
+            from netmiko.ssh_dispatcher import CLASS_MAPPER
+            for device_type in PRELOAD_DEVICE_TYPES:
+                CLASS_MAPPER[device_type]
+            logger.debug("Netmiko drivers preloaded: %s", ", ".join(PRELOAD_DEVICE_TYPES))
+        except Exception as e:
+            logger.warning(f"⚠️  Netmiko driver preload failed (will load on first connect): {e}")
+
+    def _touch_session(self, device_id: str, session: DeviceSession, now: float, hold: bool = False):
+        """Mark a session used (adding a holder if asked) and move it to the most-recently-used end of the pool"""
+        session.last_used = now
+        with self._connections_lock:
+            if hold:
+                session.holders += 1
+            if device_id in self.sessions:
+                self.sessions.move_to_end(device_id)
+
+    def _evict_lru_sessions(self):
+        """Disconnect least recently used idle sessions while the pool is over MAX_POOL_SIZE"""
+        with self._connections_lock:
+            overflow = len(self.sessions) - MAX_POOL_SIZE
+            idle = ((device_id, session) for device_id, session in self.sessions.items() if not session.in_use)
+            evicted = list(itertools.islice(idle, overflow)) if overflow > 0 else []
+
+        for device_id, session in evicted:
+            if self._disconnect_if_idle(device_id, session):
+                logger.info("♻️  Pool full (%d), evicted least recently used session %s", MAX_POOL_SIZE, device_id)
+
+    def _disconnect_if_idle(self, device_id: str, session: DeviceSession) -> bool:
+        """Disconnect a pooled session only if it is still unheld and no command is running on it"""
+        if not session.lock.acquire(blocking=False):
+            return False
+        try:
+            # Re-check under the lock: connect() may have handed it out since it was picked
+            with self._connections_lock:
+                if session.in_use or self.sessions.get(device_id) is not session:
+                    return False
+                del self.sessions[device_id]
+            try:
+                self._close_session(device_id, session)
+            except DeviceConnectionError:
+                pass
+            return True
+        finally:
+            session.lock.release()
+
+    def _get_pooled_connection(self, device_id: str, pool_key: tuple) -> Optional['ConnectHandler']:
+        """Return the pooled session for a device if it is alive, fresh and for the same target"""
+        session = self.sessions.get(device_id)
+        if session is None:
+            return None
+
+        # A session another caller holds is live and must not be probed or dropped
+        # under it: join as an extra holder (commands serialize on session.lock)
+        if session.in_use:
+            held = self._join_held_session(device_id, session, pool_key)
+            if held is not None:
+                return held
+
+        # Idle session: health-check it, but not while a command is running on it
+        if not session.lock.acquire(timeout=POOL_BUSY_WAIT):
+            raise DeviceConnectionError(f"Session to {device_id} is busy with another command")
+        try:
+            # Another connect() may have taken the session while this one waited for the lock
+            held = self._join_held_session(device_id, session, pool_key)
+            if held is not None:
+                return held
+            if self.sessions.get(device_id) is not session:
+                return None
+
+            now = time.monotonic()
+            if session.pool_key == pool_key and (
+                    now - session.created < POOL_MAX_AGE and now - session.last_used < POOL_IDLE_TIMEOUT):
+                try:
+                    alive = session.conn.is_alive()
+                except Exception:
+                    alive = False
+                if alive:
+                    self._touch_session(device_id, session, now, hold=True)
+                    return session.conn
+
+            # Stale, dead or retargeted session: drop it so connect() builds a fresh one
+            logger.info("♻️  Discarding stale pooled session for %s", device_id)
+            with self._connections_lock:
+                if self.sessions.get(device_id) is not session:
+                    return None
+                del self.sessions[device_id]
+            try:
+                self._close_session(device_id, session)
+            except DeviceConnectionError:
+                pass
+            return None
+        finally:
+            session.lock.release()
+
+    def _join_held_session(self, device_id: str, session: DeviceSession, pool_key: tuple) -> Optional['ConnectHandler']:
+        """Add a holder to a session other callers already hold; None if it is unheld (or gone)"""
+        with self._connections_lock:
+            if not session.in_use or self.sessions.get(device_id) is not session:
+                return None
+            if session.pool_key != pool_key:
+                raise DeviceConnectionError(
+                    f"Session to {device_id} is in use by another caller with different connection settings"
+                )
+            session.holders += 1
+            session.last_used = time.monotonic()
+            self.sessions.move_to_end(device_id)
+            return session.conn
+
+    def _start_pool_janitor(self):
+        """Start the background sweeper for pooled sessions unless it is already running"""
+        if self._pool_janitor is not None:
+            return
+        with self._connections_lock:
+            if self._pool_janitor is not None:
+                return
+            self._pool_janitor = threading.Thread(
+                target=self._run_pool_janitor, name="ssh-pool-janitor", daemon=True
+            )
+        self._pool_janitor.start()
+
+    def _run_pool_janitor(self):
+        """Janitor loop: evict idle/expired sessions every POOL_SWEEP_INTERVAL seconds"""
+        while True:
+            time.sleep(POOL_SWEEP_INTERVAL)
+            try:
+                self._sweep_idle_connections()
+            except Exception as e:
+                logger.warning(f"⚠️  Connection pool sweep failed: {e}")
+
+    def _sweep_idle_connections(self):
+        """Disconnect released pooled sessions past the idle timeout or max age"""
+        now = time.monotonic()
+        with self._connections_lock:
+            expired = [
+                (device_id, session) for device_id, session in self.sessions.items()
+                if not session.in_use and (now - session.last_used >= POOL_IDLE_TIMEOUT
+                                           or now - session.created >= POOL_MAX_AGE)
+            ]
+
+        for device_id, session in expired:
+            if self._disconnect_if_idle(device_id, session):
+                logger.info(f"♻️  Evicted idle pooled session for {device_id}")
+
+    def connect(self, device_id: str, device_info: dict, timeout: int = 5,
+                fetch_prompt: bool = False) -> dict:
         """
         Establish SSH connection to a device (MUST go through jumphost when enabled)
 
@@ -279,12 +1095,25 @@ class SSHConnectionManager:
             device_id: Unique device identifier
             device_info: Dict with ipAddress, username, password, port
             timeout: Connection timeout in seconds
+            fetch_prompt: Ask the device for its full prompt now (one extra round
+                trip); by default the prompt Netmiko read during session
+                preparation is returned and the command prompt is looked up
+                on first use
 
         Returns:
             Dict with connection status and info
         """
+        # Bind the fields used throughout once; the failure path below relies on them too
+        name = device_info.get('deviceName', device_id)
+        ip = device_info.get('ipAddress')
+        port = device_info.get('port', 22)
+        jumphost_config = None
+        failure_key = None
+        channel = sock = session_log = connection = None
         try:
-            logger.info(f"🔌 Attempting SSH connection to {device_info['deviceName']} ({device_info['ipAddress']})")
+            if not ip:
+                raise DeviceConnectionError(f"No IP address configured for {name}")
+            logger.info("🔌 Attempting SSH connection to %s (%s)", name, ip)
 
             # SECURITY: Check if jumphost is required
             jumphost_config = load_jumphost_config()
@@ -292,36 +1121,14 @@ class SSHConnectionManager:
 
             if jumphost_required:
                 # ENFORCE: All connections MUST go through jumphost
-                logger.info(f"🔒 Jumphost REQUIRED - all connections must route via {jumphost_config['host']}")
-
-            # Check if jumphost is enabled and connect through it
-            jumphost_tunnel = self._ensure_jumphost_connected()
-            via_jumphost = jumphost_tunnel is not None
-
-            # SECURITY: Block direct connections when jumphost is required
-            if jumphost_required and not via_jumphost:
-                raise DeviceConnectionError(
-                    f"SECURITY: Jumphost is required but tunnel is not available. "
-                    f"Cannot make direct connection to {device_info['ipAddress']}. "
-                    f"Check jumphost configuration: {jumphost_config['host']}:{jumphost_config.get('port', 22)}"
-                )
-
-            if via_jumphost:
-                logger.info(f"🔗 Routing connection via jumphost {jumphost_config['host']}")
+                logger.info("🔒 Jumphost REQUIRED - all connections must route via %s", jumphost_config['host'])
 
             # Determine Netmiko device_type based on software/platform
-            netmiko_device_type = 'cisco_ios' # Default
-            software = device_info.get('software', '').upper()
-            platform = device_info.get('platform', '').upper()
-
-            if 'XR' in software or 'ASR9' in platform:
-                netmiko_device_type = 'cisco_xr'
-            elif 'NX' in software or 'NEXUS' in platform:
-                netmiko_device_type = 'cisco_nxos'
-            elif 'XE' in software:
-                netmiko_device_type = 'cisco_ios'
+            netmiko_device_type = _resolve_device_type(
+                device_info.get('software', ''), device_info.get('platform', '')
+            )
 
-            logger.info(f"🔧 Using Netmiko driver: {netmiko_device_type} for {device_info['deviceName']}")
+            logger.info("🔧 Using Netmiko driver: %s for %s", netmiko_device_type, name)
 
             # Get device credentials:
             # BOTH username AND password come from jumphost settings
@@ -334,9 +1141,9 @@ class SSHConnectionManager:
                 # Fallback to .env.local or device record only if jumphost username not configured
                 router_creds = get_router_credentials()
                 device_username = device_info.get('username', '').strip() or router_creds.get('username', 'cisco')
-                logger.info(f"🔑 Using fallback username for {device_info['deviceName']}")
+                logger.info("🔑 Using fallback username for %s", name)
             else:
-                logger.info(f"🔑 Using jumphost username '{device_username}' for {device_info['deviceName']} (shared credentials)")
+                logger.info("🔑 Using jumphost username '%s' for %s (shared credentials)", device_username, name)
 
             # PASSWORD: Always use jumphost password - all devices share same credentials
             device_password = jumphost_config.get('password', '').strip()
@@ -344,57 +1151,166 @@ class SSHConnectionManager:
                 # Fallback to .env.local only if jumphost password not configured
                 router_creds = get_router_credentials()
                 device_password = router_creds.get('password', '')
-                logger.info(f"🔑 Using fallback password from .env.local for {device_info['deviceName']}")
+                logger.info("🔑 Using fallback password from .env.local for %s", name)
+            else:
+                logger.info("🔑 Using jumphost password for %s (shared credentials)", name)
+
+            # POOL: Reuse a live session to the same target instead of a new SSH handshake
+            pool_key = (
+                ip, port, device_username, netmiko_device_type,
+                jumphost_config['host'] if jumphost_required else None
+            )
+            if POOL_ENABLED:
+                connection = self._get_pooled_connection(device_id, pool_key)
+            elif device_id in self.sessions:
+                # Pooling off: never hand back an old session, replace it
+                self.disconnect(device_id)
+            if connection is not None:
+                jumphost_info = f"{jumphost_config['host']}:{jumphost_config.get('port', 22)}" if jumphost_required else None
+                logger.info("♻️  Reusing pooled session to %s", name)
+                return {
+                    'status': 'connected',
+                    'device_id': device_id,
+                    'device_name': name,
+                    'ip_address': ip,
+                    'prompt': connection.base_prompt,
+                    'connected_at': datetime.now().isoformat(),
+                    'via_jumphost': jumphost_info,
+                    'reused': True
+                }
+
+            # Circuit breaker: don't sit through another timeout for a target that just failed
+            if CONNECT_FAILURE_COOLDOWN > 0:
+                self._check_recent_failure((ip, port))
+                failure_key = (ip, port)
+
+            # Check if jumphost is enabled and connect through it
+            use_openssh = jumphost_required and JUMPHOST_MODE == 'openssh'
+            if use_openssh:
+                # The system ssh client owns the jumphost connection; no paramiko tunnel
+                jumphost_tunnel = None
+                via_jumphost = True
             else:
-                logger.info(f"🔑 Using jumphost password for {device_info['deviceName']} (shared credentials)")
+                jumphost_tunnel = self._ensure_jumphost_connected(jumphost_config)
+                via_jumphost = jumphost_tunnel is not None
+
+            # SECURITY: Block direct connections when jumphost is required
+            if jumphost_required and not via_jumphost:
+                raise DeviceConnectionError(
+                    f"SECURITY: Jumphost is required but tunnel is not available. "
+                    f"Cannot make direct connection to {ip}. "
+                    f"Check jumphost configuration: {jumphost_config['host']}:{jumphost_config.get('port', 22)}"
+                )
+
+            if via_jumphost:
+                logger.info("🔗 Routing connection via jumphost %s", jumphost_config['host'])
 
             # Netmiko device parameters
             device_params = {
                 'device_type': netmiko_device_type,
-                'host': device_info['ipAddress'],
+                'host': ip,
                 'username': device_username,  # Per-device or fallback
                 'password': device_password,  # Per-device or fallback
-                'port': device_info.get('port', 22),
+                'port': port,
                 'timeout': timeout,
-                'session_log': f"logs/{device_id}_session.log",
-                'fast_cli': False,
-                'global_delay_factor': 2,
+                # Netmiko sleeps dominate command latency; slow devices can opt out via device_info
+                'fast_cli': device_info.get('fast_cli', True),
+                'global_delay_factor': device_info.get('global_delay_factor', 1),
                 # Add algorithms for legacy/strict devices
                 'conn_timeout': timeout + 5,
                 'auth_timeout': timeout + 5,
             }
+            if device_info.get('read_timeout_override'):
+                device_params['read_timeout_override'] = device_info['read_timeout_override']
+            if SESSION_LOG_ENABLED:
+                # Stream into the shared rotating session log (no per-device file)
+                session_log = _SESSION_LOGS.stream(device_id)
+                device_params['session_log'] = session_log
 
             # If using jumphost, create tunnel channel and pass as socket (thread-safe)
-            if via_jumphost:
+            if use_openssh:
+                sock = _openssh_proxy(jumphost_config, ip, port)
+                device_params['sock'] = sock
+                logger.info("🔗 Using OpenSSH jumphost multiplexing for %s", name)
+            elif via_jumphost:
                 with self._jumphost_lock:
-                    channel = jumphost_tunnel.create_channel(
-                        device_info['ipAddress'],
-                        device_info.get('port', 22)
-                    )
-                    device_params['sock'] = channel
-                    self.device_channels[device_id] = channel
-                logger.info(f"🔗 Using jumphost tunnel for {device_info['deviceName']}")
+                    # Transport is in use again - keep it open
+                    if self._jumphost_idle_timer is not None:
+                        self._jumphost_idle_timer.cancel()
+                        self._jumphost_idle_timer = None
+                    with self._connections_lock:
+                        self._pending_channels += 1
+                    self._start_jumphost_probe()
+                # Opened outside the lock so parallel connects share the transport concurrently
+                try:
+                    channel = jumphost_tunnel.create_channel(ip, port)
+                except Exception:
+                    with self._connections_lock:
+                        self._pending_channels -= 1
+                    self._schedule_jumphost_idle_close()
+                    raise
+                device_params['sock'] = channel
+                logger.info("🔗 Using jumphost tunnel for %s", name)
+            else:
+                # Direct path: hand Netmiko a socket with TCP_NODELAY already set
+                sock = _open_tcp_socket(ip, port, timeout + 5)
+                device_params['sock'] = sock
 
             # Establish connection
-            connection = ConnectHandler(**device_params)
-            
-            # Store connection
-            self.active_connections[device_id] = connection
-            
-            # Get device prompt
-            prompt = connection.find_prompt()
+            connection = self._connect_handler()(**device_params)
             
+            # Netmiko already read the prompt while preparing the session
+            if fetch_prompt:
+                prompt = connection.find_prompt()
+                prompt_pattern = re.escape(prompt.strip())
+            else:
+                prompt = connection.base_prompt
+                prompt_pattern = None
+
+            # Store the session in the pool as a single record
+            session = DeviceSession(connection, channel=channel, pool_key=pool_key,
+                                    prompt_pattern=prompt_pattern, session_log=session_log)
+            with self._connections_lock:
+                existing = self.sessions.get(device_id)
+                # A concurrent connect() to the same target registered first: share its session
+                joined = existing is not None and existing.pool_key == pool_key
+                if joined:
+                    existing.holders += 1
+                    existing.last_used = session.created
+                else:
+                    self.sessions[device_id] = session
+                    if channel is not None:
+                        self._pending_channels -= 1
+                self.sessions.move_to_end(device_id)
+            if joined:
+                logger.info("♻️  Concurrent connect to %s registered first, closing the duplicate session", name)
+                self._discard_partial_session(connection, channel, sock, session_log)
+                prompt = existing.conn.base_prompt
+            elif existing is not None:
+                # Replaced a session to an old target: close it so its connection and channel are not leaked
+                try:
+                    self._close_session(device_id, existing)
+                except DeviceConnectionError:
+                    pass
+            # The session owns these now; the failure path below must not close them
+            connection = channel = sock = session_log = None
+            if failure_key is not None:
+                self._recent_failures.pop(failure_key, None)
+            self._evict_lru_sessions()
+            if POOL_ENABLED:
+                self._start_pool_janitor()
+
             jumphost_info = None
             if via_jumphost:
-                jumphost_config = load_jumphost_config()
                 jumphost_info = f"{jumphost_config['host']}:{jumphost_config.get('port', 22)}"
 
-            logger.info(f"✅ Successfully connected to {device_info['deviceName']} - Prompt: {prompt}" +
-                        (f" (via jumphost {jumphost_info})" if jumphost_info else ""))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"✅ Successfully connected to {name} - Prompt: {prompt}" +
+                            (f" (via jumphost {jumphost_info})" if jumphost_info else ""))
 
             # Audit log: device connection success
-            AuditLogger.log_device_connect(
-                device_id, device_info['deviceName'], device_info['ipAddress'],
+            _AUDIT.submit(AuditLogger.log_device_connect,
+                device_id, name, ip,
                 via_jumphost=via_jumphost,
                 jumphost_host=jumphost_info.split(':')[0] if jumphost_info else None,
                 success=True
@@ -403,26 +1319,95 @@ class SSHConnectionManager:
             return {
                 'status': 'connected',
                 'device_id': device_id,
-                'device_name': device_info['deviceName'],
-                'ip_address': device_info['ipAddress'],
+                'device_name': name,
+                'ip_address': ip,
                 'prompt': prompt,
                 'connected_at': datetime.now().isoformat(),
                 'via_jumphost': jumphost_info
             }
 
         except Exception as e:
+            # Nothing was registered: release whatever this attempt opened
+            self._discard_partial_session(connection, channel, sock, session_log)
+            # Only an unreachable target opens the breaker; jumphost, auth and config
+            # errors are not about this (ip, port) and would block it for nothing
+            if failure_key is not None and self._target_unreachable(e):
+                self._recent_failures[failure_key] = time.monotonic()
+
             # Audit log: device connection failure
-            AuditLogger.log_device_connect(
-                device_id, device_info.get('deviceName', device_id), device_info.get('ipAddress', 'unknown'),
-                via_jumphost=jumphost_config.get('enabled', False) if 'jumphost_config' in dir() else False,
-                jumphost_host=jumphost_config.get('host') if 'jumphost_config' in dir() else None,
+            _AUDIT.submit(AuditLogger.log_device_connect,
+                device_id, name, ip or 'unknown',
+                via_jumphost=jumphost_config.get('enabled', False) if jumphost_config else False,
+                jumphost_host=jumphost_config.get('host') if jumphost_config else None,
                 success=False, error_message=str(e)
             )
 
             # NO MOCK FALLBACK - Connection failures should be explicit
-            logger.error(f"❌ SSH connection FAILED to {device_info['deviceName']} ({device_info['ipAddress']}): {str(e)}")
+            logger.error(f"❌ SSH connection FAILED to {name} ({ip or 'unknown'}): {str(e)}")
+
+            raise DeviceConnectionError(f"SSH connection failed to {name} ({ip or 'unknown'}): {str(e)}")
+
+    @staticmethod
+    def _target_unreachable(exc: Exception) -> bool:
+        """True if a connect failure means the target refused or timed out the TCP/SSH connect"""
+        if isinstance(exc, (DeviceUnreachableError, TimeoutError)):
+            return True
+        try:
+            from netmiko.exceptions import NetmikoTimeoutException
+        except ImportError:
+            return False
+        return isinstance(exc, NetmikoTimeoutException)
+
+    def clear_recent_failures(self):
+        """Forget every recent connect failure (the route to the devices changed)"""
+        self._recent_failures.clear()
+
+    def _check_recent_failure(self, key: Tuple[str, int]):
+        """Raise if key failed to connect less than CONNECT_FAILURE_COOLDOWN seconds ago"""
+        failed_at = self._recent_failures.get(key)
+        if failed_at is None:
+            return
+        remaining = CONNECT_FAILURE_COOLDOWN - (time.monotonic() - failed_at)
+        if remaining > 0:
+            raise DeviceConnectionError(
+                f"circuit open: {key[0]}:{key[1]} was unreachable moments ago, retry in {remaining:.0f}s"
+            )
+        self._recent_failures.pop(key, None)
+
+    def connect_many(self, devices: List[Tuple[str, dict]], timeout: int = 5,
+                     max_workers: Optional[int] = None) -> List[dict]:
+        """
+        Connect to several devices concurrently
 
-            raise DeviceConnectionError(f"SSH connection failed to {device_info['deviceName']} ({device_info['ipAddress']}): {str(e)}")
+        Args:
+            devices: List of (device_id, device_info) pairs
+            timeout: Per-device connection timeout in seconds
+            max_workers: Thread count (default: min(64, len(devices)))
+
+        Returns:
+            List of connect() results in completion order; failures are
+            returned as {'device_id', 'status': 'error', 'error'} entries
+        """
+        if not devices:
+            return []
+
+        results = []
+        workers = max_workers or min(64, len(devices))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.connect, device_id, device_info, timeout): device_id
+                for device_id, device_info in devices
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({
+                        'device_id': futures[future],
+                        'status': 'error',
+                        'error': str(e)
+                    })
+        return results
 
     def disconnect(self, device_id: str) -> dict:
         """
@@ -434,24 +1419,28 @@ class SSHConnectionManager:
         Returns:
             Dict with disconnection status
         """
+        # Detach from the shared dicts first; teardown happens outside the lock
+        with self._connections_lock:
+            session = self.sessions.pop(device_id, None)
+
+        if session is None:
+            logger.warning("⚠️  Device %s not connected", device_id)
+            return {'status': 'not_connected', 'device_id': device_id}
+        return self._close_session(device_id, session)
+
+    def _close_session(self, device_id: str, session: DeviceSession) -> dict:
+        """Tear down a session already removed from the pool"""
+        channel = session.channel
         try:
-            if device_id not in self.active_connections:
-                logger.warning(f"⚠️  Device {device_id} not connected")
-                return {'status': 'not_connected', 'device_id': device_id}
-
-            connection = self.active_connections[device_id]
-            connection.disconnect()
-            del self.active_connections[device_id]
+            session.conn.disconnect()
+            self._close_session_log(session)
 
             # Clean up channel if it exists
-            if device_id in self.device_channels:
-                try:
-                    self.device_channels[device_id].close()
-                except:
-                    pass
-                del self.device_channels[device_id]
+            if channel is not None:
+                self._close_channel(channel)
+                self._schedule_jumphost_idle_close()
 
-            logger.info(f"✅ Disconnected from device {device_id}")
+            logger.info("✅ Disconnected from device %s", device_id)
 
             return {
                 'status': 'disconnected',
@@ -461,33 +1450,159 @@ class SSHConnectionManager:
 
         except Exception as e:
             logger.error(f"❌ Error disconnecting from {device_id}: {str(e)}")
-            # Remove from active connections anyway
-            self.active_connections.pop(device_id, None)
-            self.device_channels.pop(device_id, None)
+            self._close_session_log(session)
+            # Already removed from active connections; make sure the channel is released
+            if channel is not None:
+                self._close_channel(channel)
             raise DeviceConnectionError(f"Disconnect error: {str(e)}")
 
+    def _close_channel(self, channel):
+        """Close a device's jumphost channel, returning its slot to the tunnel that opened it"""
+        tunnel = self.jumphost_tunnel
+        if tunnel is not None:
+            tunnel.release_channel(channel)
+            return
+        try:
+            channel.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _close_session_log(session: DeviceSession):
+        """Flush and close the session log handle opened for a session, if any"""
+        if session.session_log is not None:
+            try:
+                session.session_log.close()
+            except OSError:
+                pass
+            session.session_log = None
+
+    def _discard_partial_session(self, connection, channel, sock, session_log):
+        """Tear down the pieces of a connect() attempt that failed before its session was stored"""
+        if connection is not None:
+            try:
+                connection.disconnect()
+            except Exception:
+                pass
+        if channel is not None:
+            with self._connections_lock:
+                self._pending_channels -= 1
+            self._close_channel(channel)
+            self._schedule_jumphost_idle_close()
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        if session_log is not None:
+            try:
+                session_log.close()
+            except OSError:
+                pass
+
+    def release(self, device_id: str) -> dict:
+        """
+        Return a device session to the pool instead of closing it
+
+        Drops the hold the caller took with connect(). Once no caller holds
+        the session it stays open for reuse by the next connect() to the
+        same target until the janitor evicts it (idle timeout / max age).
+        When CONNECTION_POOL_ENABLED is off this is the same as disconnect().
+
+        Args:
+            device_id: Device whose session is no longer needed by the caller
+
+        Returns:
+            Dict with release status
+        """
+        if not POOL_ENABLED:
+            return self.disconnect(device_id)
+
+        with self._connections_lock:
+            session = self.sessions.get(device_id)
+            if session is None:
+                return {'status': 'not_connected', 'device_id': device_id}
+            if session.holders > 0:
+                session.holders -= 1
+            session.last_used = time.monotonic()
+        logger.debug("♻️  Released %s back to the connection pool", device_id)
+        return {'status': 'released', 'device_id': device_id}
+
+    def abort(self, device_id: str) -> bool:
+        """
+        Disconnect a session to interrupt the caller's in-flight command
+
+        The session is left alone while other callers also hold it, so
+        stopping one job never tears down another job's session.
+
+        Args:
+            device_id: Device whose session the caller holds
+
+        Returns:
+            True if the session was disconnected
+        """
+        with self._connections_lock:
+            session = self.sessions.get(device_id)
+            if session is None or session.holders > 1:
+                return False
+            del self.sessions[device_id]
+        self._close_session(device_id, session)
+        return True
+
     def is_connected(self, device_id: str) -> bool:
         """Check if device is currently connected"""
-        return device_id in self.active_connections
+        return device_id in self.sessions
+
+    def get_connection(self, device_id: str) -> Optional['ConnectHandler']:
+        """Get active connection for a device (does not take a hold; use connect() for that)"""
+        session = self.sessions.get(device_id)
+        if session is not None:
+            self._touch_session(device_id, session, time.monotonic())
+        return session.conn if session is not None else None
+
+    def command_lock(self, device_id: str):
+        """Lock to hold while sending commands over a device's session (no-op if not connected)"""
+        session = self.sessions.get(device_id)
+        return session.lock if session is not None else contextlib.nullcontext()
+
+    def get_prompt_pattern(self, device_id: str) -> Optional[str]:
+        """Get the escaped prompt regex for a connected device (found once per session)"""
+        session = self.sessions.get(device_id)
+        if session is None:
+            return None
+        if session.prompt_pattern is None:
+            session.prompt_pattern = re.escape(session.conn.find_prompt().strip())
+        return session.prompt_pattern
 
-    def get_connection(self, device_id: str) -> Optional[ConnectHandler]:
-        """Get active connection for a device"""
-        return self.active_connections.get(device_id)
+    def _disconnect_no_raise(self, device_id: str) -> Optional[str]:
+        """Disconnect a device, returning the error message instead of raising (None on success)"""
+        try:
+            self.disconnect(device_id)
+            return None
+        except Exception as e:
+            return str(e)
 
     def disconnect_all(self) -> dict:
         """Disconnect from all devices and close jumphost tunnel"""
         disconnected_count = 0
         errors = []
 
-        for device_id in list(self.active_connections.keys()):
-            try:
-                self.disconnect(device_id)
-                disconnected_count += 1
-            except Exception as e:
-                errors.append(f"{device_id}: {str(e)}")
-
-        # Close jumphost tunnel if no devices are connected
-        if len(self.active_connections) == 0 and self.jumphost_tunnel:
+        with self._connections_lock:
+            device_ids = list(self.sessions.keys())
+
+        # SSH teardown is I/O bound, so fan the disconnects out in parallel
+        if device_ids:
+            with ThreadPoolExecutor(max_workers=min(32, len(device_ids))) as executor:
+                futures = {executor.submit(self._disconnect_no_raise, device_id): device_id for device_id in device_ids}
+                for future in as_completed(futures):
+                    error = future.result()
+                    if error is None:
+                        disconnected_count += 1
+                    else:
+                        errors.append(f"{futures[future]}: {error}")
+
+        # Close jumphost tunnel if no devices are connected (serial, after all workers finish)
+        if len(self.sessions) == 0 and self.jumphost_tunnel:
             self.close_jumphost_tunnel()
 
         logger.info(f"🔌 Disconnected from {disconnected_count} devices")
@@ -499,19 +1614,24 @@ class SSHConnectionManager:
 
     def close_jumphost_tunnel(self):
         """Close the jumphost tunnel"""
+        if self._jumphost_idle_timer is not None:
+            self._jumphost_idle_timer.cancel()
+            self._jumphost_idle_timer = None
         if self.jumphost_tunnel:
             logger.info("🔌 Closing jumphost tunnel...")
             self.jumphost_tunnel.close()
             self.jumphost_tunnel = None
 
-    def get_jumphost_status(self) -> dict:
-        """Get current jumphost configuration and connection status"""
-        config = load_jumphost_config()
+    def get_jumphost_status(self, jumphost_config: Optional[Dict] = None) -> dict:
+        """Get current jumphost configuration and connection status (pass a loaded config to skip reloading it)"""
+        config = jumphost_config if jumphost_config is not None else load_jumphost_config()
         is_connected = (
             self.jumphost_tunnel is not None and
             self.jumphost_tunnel.transport is not None and
             self.jumphost_tunnel.transport.is_active()
         )
+        with self._connections_lock:
+            active_tunnels = sum(1 for session in self.sessions.values() if session.channel is not None)
 
         return {
             'enabled': config.get('enabled', False),
@@ -519,12 +1639,13 @@ class SSHConnectionManager:
             'port': config.get('port', 22),
             'username': config.get('username', ''),
             'connected': is_connected,
-            'active_tunnels': len(self.device_channels)
+            'active_tunnels': active_tunnels
         }
 
     def get_active_connections(self) -> list:
         """Get list of all active connection IDs"""
-        return list(self.active_connections.keys())
+        with self._connections_lock:
+            return list(self.sessions.keys())
 
 # Global connection manager instance
 connection_manager = SSHConnectionManager()
@@ -4,57 +4,124 @@ Encrypts and decrypts device passwords using Fernet (symmetric encryption)
 """
 
 import os
+import base64
+import hashlib
+import hmac
 import logging
+import struct
+import tempfile
+import time
 from cryptography.fernet import Fernet
-from typing import Optional
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar
 
 logger = logging.getLogger(__name__)
 
 # Encryption key location
 ENCRYPTION_KEY_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.encryption_key')
 
+# Reads of a key file another process has just linked into place
+KEY_FILE_RETRIES = 5
+KEY_FILE_RETRY_DELAY = 0.1  # Seconds between them
+
+def _load_encryption_key() -> Optional[bytes]:
+    """Read and validate the key file; None if it does not exist (raises if it is invalid)"""
+    # Open directly instead of checking existence first (no TOCTOU window)
+    try:
+        with open(ENCRYPTION_KEY_FILE, 'rb') as f:
+            key = f.read()
+    except FileNotFoundError:
+        return None
+    Fernet(key)  # This will raise if key is invalid
+    return key
+
+def _publish_encryption_key(key: bytes) -> bool:
+    """
+    Install key as the key file without ever exposing a partial file
+
+    The key is written to a mode 600 temp file in the same directory and
+    hard-linked into place. os.link fails instead of clobbering a key
+    another process created first.
+
+    Returns:
+        bool: False if another process's key file was already in place
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(ENCRYPTION_KEY_FILE), prefix=".encryption_key-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+            f.flush()
+            os.fsync(f.fileno())
+        os.link(tmp_path, ENCRYPTION_KEY_FILE)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.unlink(tmp_path)
+
 def get_or_create_encryption_key() -> bytes:
     """
     Get existing encryption key or create a new one
-    
+
+    Safe when several processes start at once: exactly one creates the key
+    and the others load it.
+
     Returns:
         bytes: Encryption key
     """
-    # Check if key file exists
-    if os.path.exists(ENCRYPTION_KEY_FILE):
+    try:
+        key = _load_encryption_key()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load encryption key: {e}. Generating new key...")
+        # Key files are only ever linked in whole, so this one is bad, not half-written
         try:
-            with open(ENCRYPTION_KEY_FILE, 'rb') as f:
-                key = f.read()
-                # Validate key
-                Fernet(key)  # This will raise if key is invalid
-                logger.info("✅ Loaded existing encryption key")
-                return key
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to load encryption key: {e}. Generating new key...")
-    
+            os.unlink(ENCRYPTION_KEY_FILE)
+        except FileNotFoundError:
+            pass
+        key = None
+    if key is not None:
+        logger.info("✅ Loaded existing encryption key")
+        return key
+
     # Generate new key
     key = Fernet.generate_key()
-    
-    # Save key to file with restricted permissions
     try:
-        with open(ENCRYPTION_KEY_FILE, 'wb') as f:
-            f.write(key)
-        
-        # Set file permissions to 600 (read/write for owner only)
-        os.chmod(ENCRYPTION_KEY_FILE, 0o600)
-        
-        logger.info(f"✅ Generated new encryption key and saved to {ENCRYPTION_KEY_FILE}")
-        logger.warning("⚠️ IMPORTANT: Backup this key file! Without it, encrypted passwords cannot be decrypted!")
-        
-        return key
+        created = _publish_encryption_key(key)
     except Exception as e:
         logger.error(f"❌ Failed to save encryption key: {e}")
         raise
 
+    if created:
+        logger.info(f"✅ Generated new encryption key and saved to {ENCRYPTION_KEY_FILE}")
+        logger.warning("⚠️ IMPORTANT: Backup this key file! Without it, encrypted passwords cannot be decrypted!")
+        return key
+
+    # Another process created the key first: use theirs
+    last_error = None
+    for _ in range(KEY_FILE_RETRIES):
+        try:
+            key = _load_encryption_key()
+            if key is not None:
+                logger.info("✅ Loaded encryption key created by another process")
+                return key
+        except Exception as e:
+            last_error = e
+        time.sleep(KEY_FILE_RETRY_DELAY)
+
+    logger.error(f"❌ Failed to load encryption key created by another process: {last_error}")
+    raise RuntimeError(f"Encryption key file {ENCRYPTION_KEY_FILE} is not readable: {last_error}")
+
 # Initialize Fernet cipher with key
 _ENCRYPTION_KEY = get_or_create_encryption_key()
 _CIPHER = Fernet(_ENCRYPTION_KEY)
 
+# Fernet key halves (signing key, AES-128 key) for the bulk fast path below
+_RAW_KEY = base64.urlsafe_b64decode(_ENCRYPTION_KEY)
+_SIGNING_KEY = _RAW_KEY[:16]
+_AES_KEY = algorithms.AES(_RAW_KEY[16:])
+_FERNET_OVERHEAD = 1 + 8 + 16 + 32  # Version, timestamp, IV, HMAC
+
 def encrypt_password(plaintext: str) -> str:
     """
     Encrypt a plaintext password
@@ -77,6 +144,61 @@ def encrypt_password(plaintext: str) -> str:
         logger.error(f"❌ Failed to encrypt password: {e}")
         raise
 
+def encrypt_password_fast(plaintext: str) -> str:
+    """
+    Encrypt a plaintext password straight to a Fernet token
+
+    Produces exactly the token format Fernet does (decrypt_password() reads
+    it back), but drives AES-CBC and HMAC-SHA256 directly with the key
+    halves split once at import. Meant for bulk loops such as password
+    migration; use encrypt_password() for one-off calls.
+
+    Args:
+        plaintext: Password in plaintext
+
+    Returns:
+        str: Encrypted password (base64-encoded Fernet token)
+    """
+    if not plaintext:
+        return ""
+
+    return _fernet_token(plaintext, hmac.new(_SIGNING_KEY, digestmod=hashlib.sha256))
+
+def _fernet_token(plaintext: str, mac) -> str:
+    """Build a Fernet token for plaintext, signing with mac (a fresh or copied HMAC-SHA256)"""
+    iv = os.urandom(16)
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(plaintext.encode('utf-8')) + padder.finalize()
+    encryptor = Cipher(_AES_KEY, modes.CBC(iv)).encryptor()
+    ciphertext = encryptor.update(padded) + encryptor.finalize()
+
+    basic_parts = b"\x80" + struct.pack(">Q", int(time.time())) + iv + ciphertext
+    mac.update(basic_parts)
+    return base64.urlsafe_b64encode(basic_parts + mac.digest()).decode('ascii')
+
+K = TypeVar('K')
+
+def migrate_passwords_bulk(pairs: Iterable[Tuple[K, str]]) -> Iterator[Tuple[K, str]]:
+    """
+    Migrate many passwords in one pass (encrypt plaintext, leave encrypted as-is)
+
+    The HMAC-SHA256 state keyed with the signing key is built once and
+    copied per password instead of re-keyed each time; only the AES-CBC
+    context is new per record, since every token needs a fresh IV.
+
+    Args:
+        pairs: (key, password) pairs, e.g. (device_id, password) rows
+
+    Yields:
+        (key, encrypted_password) in input order
+    """
+    mac_template = hmac.new(_SIGNING_KEY, digestmod=hashlib.sha256)
+    for key, password in pairs:
+        if not password or is_encrypted(password):
+            yield key, password
+        else:
+            yield key, _fernet_token(password, mac_template.copy())
+
 def decrypt_password(encrypted: str) -> str:
     """
     Decrypt an encrypted password
@@ -105,6 +227,11 @@ def is_encrypted(password: str) -> bool:
     """
     Check if a password is already encrypted
     
+    This is a format check, not an authenticity check: it accepts anything
+    shaped like a Fernet token (version byte 0x80, timestamp, IV, whole AES
+    blocks, HMAC) without verifying it. decrypt_password() does the full
+    HMAC verification when the value is actually used.
+    
     Args:
         password: Password string to check
         
@@ -115,12 +242,16 @@ def is_encrypted(password: str) -> bool:
         return False
     
     try:
-        # Try to decrypt - if successful, it's encrypted
-        _CIPHER.decrypt(password.encode('utf-8'))
-        return True
-    except:
-        # If decryption fails, it's plaintext
+        # validate=True rejects characters outside the urlsafe alphabet instead of
+        # silently dropping them, so plaintext cannot decode into a token-shaped blob
+        raw = base64.b64decode(password.encode('ascii'), altchars=b'-_', validate=True)
+    except Exception:
+        # Not base64 at all, so it's plaintext
         return False
+    
+    # 0x80 + 8-byte timestamp + 16-byte IV + N*16-byte ciphertext + 32-byte HMAC
+    body = len(raw) - _FERNET_OVERHEAD
+    return raw[:1] == b"\x80" and body >= 16 and body % 16 == 0
 
 def migrate_password(password: str) -> str:
     """
@@ -137,7 +268,7 @@ def migrate_password(password: str) -> str:
         return password
     else:
         logger.info("🔄 Migrating plaintext password to encrypted format")
-        return encrypt_password(password)
+        return encrypt_password_fast(password)
 
 # Encryption status checker
 def get_encryption_status() -> dict:
@@ -174,6 +305,11 @@ if __name__ == "__main__":
     assert is_encrypted(encrypted), "is_encrypted() should return True for encrypted password"
     assert not is_encrypted(test_password), "is_encrypted() should return False for plaintext"
     print("✅ is_encrypted() test passed!")
+
+    # Test fast path produces tokens the regular path can read
+    fast_encrypted = encrypt_password_fast(test_password)
+    assert decrypt_password(fast_encrypted) == test_password, "encrypt_password_fast() output must decrypt"
+    print("✅ encrypt_password_fast() test passed!")
     
     # Test migration
     migrated = migrate_password(test_password)
@@ -4,8 +4,10 @@ Loads credentials from .env.local file
 """
 
 import os
+import functools
 import logging
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -14,42 +16,51 @@ logger = logging.getLogger(__name__)
 ENV_FILE = Path(__file__).parent.parent.parent / ".env.local"
 
 _env_cache: Optional[Dict[str, str]] = None
+_env_lock = threading.Lock()  # One thread parses the file; concurrent first readers wait for it
+_UNSET = object()
+# (mtime_ns, size) of ENV_FILE (None while it is missing) when the memoized jumphost
+# config was parsed; _UNSET until the first call, so that call always parses
+_jumphost_env_stamp = _UNSET
 
 
 def load_env_file() -> Dict[str, str]:
     """Load environment variables from .env.local file"""
     global _env_cache
     
-    if _env_cache is not None:
-        return _env_cache
+    env = _env_cache
+    if env is not None:
+        return env
     
-    _env_cache = {}
-    
-    if not ENV_FILE.exists():
-        logger.warning(f"⚠️  Environment file not found: {ENV_FILE}")
-        logger.warning("⚠️  Please copy .env.temp to .env.local and configure credentials")
-        return _env_cache
-    
-    try:
-        with open(ENV_FILE, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-                # Parse KEY=VALUE
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    _env_cache[key.strip()] = value.strip()
+    with _env_lock:
+        if _env_cache is not None:
+            return _env_cache
         
-        logger.info(f"✅ Loaded environment from {ENV_FILE}")
-        logger.info(f"   Router credentials: {'configured' if 'ROUTER_USERNAME' in _env_cache else 'NOT SET'}")
-        logger.info(f"   Jumphost: {'enabled' if _env_cache.get('JUMPHOST_ENABLED', '').lower() == 'true' else 'disabled'}")
+        if not ENV_FILE.exists():
+            logger.warning(f"⚠️  Environment file not found: {ENV_FILE}")
+            logger.warning("⚠️  Please copy .env.temp to .env.local and configure credentials")
+            _env_cache = {}
+            return _env_cache
         
-    except Exception as e:
-        logger.error(f"❌ Failed to load environment file: {e}")
-    
-    return _env_cache
+        env = {}
+        try:
+            # Parse KEY=VALUE lines, skipping comments and empty lines
+            lines = (line.strip() for line in ENV_FILE.read_text().splitlines())
+            env = {
+                key.strip(): value.strip()
+                for key, value in (line.split('=', 1) for line in lines
+                                   if line and not line.startswith('#') and '=' in line)
+            }
+            
+            logger.info(f"✅ Loaded environment from {ENV_FILE}")
+            logger.info(f"   Router credentials: {'configured' if 'ROUTER_USERNAME' in env else 'NOT SET'}")
+            logger.info(f"   Jumphost: {'enabled' if env.get('JUMPHOST_ENABLED', '').lower() == 'true' else 'disabled'}")
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load environment file: {e}")
+        
+        # Publish only the fully parsed dict
+        _env_cache = env
+        return env
 
 
 def get_env(key: str, default: str = "") -> str:
@@ -59,7 +70,13 @@ def get_env(key: str, default: str = "") -> str:
 
 
 def get_router_credentials() -> Dict[str, str]:
-    """Get router SSH credentials from environment"""
+    """Get router SSH credentials from environment (built once until reload_env)"""
+    # Copy so callers cannot mutate the memoized credentials
+    return dict(_parse_router_credentials())
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_router_credentials() -> Dict[str, str]:
     env = load_env_file()
     return {
         'username': env.get('ROUTER_USERNAME', 'cisco'),
@@ -67,8 +84,30 @@ def get_router_credentials() -> Dict[str, str]:
     }
 
 
+def _env_file_stamp() -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of ENV_FILE, or None if it does not exist"""
+    try:
+        st = ENV_FILE.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def get_jumphost_config() -> Dict:
-    """Get jumphost configuration from environment"""
+    """Get jumphost configuration from environment (parsed once until reload_env or .env.local changes)"""
+    global _jumphost_env_stamp
+
+    stamp = _env_file_stamp()
+    if stamp != _jumphost_env_stamp:
+        # .env.local was created, edited or removed since the last parse (or never parsed)
+        reload_env()
+        _jumphost_env_stamp = stamp
+    # Copy so callers cannot mutate the memoized config
+    return dict(_parse_jumphost_config())
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_jumphost_config() -> Dict:
     env = load_env_file()
 
     # Support both JUMPHOST_HOST and JUMPHOST_IP for backwards compatibility
@@ -87,4 +126,6 @@ def reload_env():
     """Force reload of environment file"""
     global _env_cache
     _env_cache = None
+    _parse_jumphost_config.cache_clear()
+    _parse_router_credentials.cache_clear()
     return load_env_file()
@@ -6,9 +6,16 @@ FIXED: Now uses 'current' symlink to read from latest execution directory
 instead of hardcoded OUTPUT-Data_save path.
 """
 
+import collections
+import functools
 import logging
+import operator
 import os
-from typing import List, Dict, Optional
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -17,6 +24,55 @@ logger = logging.getLogger(__name__)
 # Get the backend directory (parent of modules/)
 BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+# Listings bigger than this stat their files on a few threads, overlapping
+# the waits on slow or network storage (os.stat releases the GIL)
+PARALLEL_STAT_THRESHOLD = 256
+PARALLEL_STAT_WORKERS = 8
+
+# Filenames that could leave the output directory or name a hidden file. Output
+# names embed raw command text ('|', ':', ...), so a character allow-list would
+# reject real files.
+_UNSAFE_NAME = re.compile(r'[/\\\x00]|\.\.|^\.')
+
+# ('current' symlink target as read, (text_dir, json_dir)) from the last successful resolution
+_resolved_dirs_cache: Optional[Tuple[str, Tuple[str, str]]] = None
+
+# list_files() results keyed by (directory, folder_type, device_name) ->
+# (directory st_mtime_ns, monotonic time cached, files), in LRU order. Module-level because the
+# API builds a fresh FileManager per request. Adding or removing a file bumps the directory mtime;
+# a file rewritten in place (or a change within one mtime tick) does not, so writers call
+# invalidate_list_cache() and entries expire after LIST_CACHE_TTL seconds regardless.
+# device_name comes from the request, hence the size bound.
+LIST_CACHE_MAX_ENTRIES = 32
+LIST_CACHE_TTL = 5.0
+_list_cache: 'collections.OrderedDict[Tuple[str, str, Optional[str]], Tuple[int, float, List[Dict]]]' = \
+    collections.OrderedDict()
+_list_cache_lock = threading.Lock()
+
+
+def invalidate_list_cache(directory: Optional[str] = None):
+    """Drop cached listings of directory (all listings when directory is None)"""
+    with _list_cache_lock:
+        if directory is None:
+            _list_cache.clear()
+            return
+        for key in [key for key in _list_cache if key[0] == directory]:
+            del _list_cache[key]
+
+
+@functools.lru_cache(maxsize=4096)
+def _iso_seconds(seconds: int) -> str:
+    """Local-time ISO string for a whole epoch second (memoized; outputs share seconds)"""
+    return datetime.fromtimestamp(seconds).isoformat()
+
+
+def _iso_timestamp(timestamp_ns: int) -> str:
+    """Same string as datetime.fromtimestamp(ts).isoformat(), from an st_*time_ns value"""
+    # Round to the microsecond like fromtimestamp() does
+    seconds, micros = divmod((timestamp_ns + 500) // 1000, 1_000_000)
+    return f"{_iso_seconds(seconds)}.{micros:06d}" if micros else _iso_seconds(seconds)
+
+
 def get_current_data_dirs():
     """
     Get the current data directories, preferring the 'current' symlink
@@ -25,24 +81,38 @@ def get_current_data_dirs():
     Returns:
         tuple: (text_dir, json_dir) paths
     """
-    current_link = os.path.join(BACKEND_DIR, "data", "current")
-
-    # If 'current' symlink exists and is valid, use it
-    if os.path.exists(current_link) and os.path.islink(current_link):
-        target = os.path.realpath(current_link)
-        if os.path.exists(target):
-            text_dir = os.path.join(target, "TEXT")
-            json_dir = os.path.join(target, "JSON")
-
-            # Only use if directories exist
-            if os.path.exists(text_dir) and os.path.exists(json_dir):
-                logger.info(f"📁 Using 'current' symlink: {target}")
-                return text_dir, json_dir
+    global _resolved_dirs_cache
+
+    data_dir = os.path.join(BACKEND_DIR, "data")
+    current_link = os.path.join(data_dir, "current")
+
+    # One readlink() tells whether the link still points where it did last time
+    try:
+        link_target = os.readlink(current_link)
+    except OSError:
+        link_target = None  # Missing, or not a symlink
+
+    if link_target is not None:
+        cached = _resolved_dirs_cache
+        if cached is not None and cached[0] == link_target:
+            return cached[1]
+
+        # If 'current' symlink is valid, use it. A relative target is joined
+        # onto the link's directory as a string; no realpath() walk.
+        target = link_target if os.path.isabs(link_target) else os.path.normpath(os.path.join(data_dir, link_target))
+        text_dir = os.path.join(target, "TEXT")
+        json_dir = os.path.join(target, "JSON")
+
+        # Only use if directories exist (which also proves the target does)
+        if os.path.isdir(text_dir) and os.path.isdir(json_dir):
+            logger.info(f"📁 Using 'current' symlink: {target}")
+            _resolved_dirs_cache = (link_target, (text_dir, json_dir))
+            return text_dir, json_dir
 
     # Fallback to legacy OUTPUT-Data_save (for backwards compatibility)
-    legacy_text = os.path.join(BACKEND_DIR, "data", "OUTPUT-Data_save", "TEXT")
-    legacy_json = os.path.join(BACKEND_DIR, "data", "OUTPUT-Data_save", "JSON")
-    logger.info(f"📁 Using legacy data path: OUTPUT-Data_save")
+    legacy_text = os.path.join(data_dir, "OUTPUT-Data_save", "TEXT")
+    legacy_json = os.path.join(data_dir, "OUTPUT-Data_save", "JSON")
+    logger.debug("📁 Using legacy data path: OUTPUT-Data_save")
     return legacy_text, legacy_json
 
 
@@ -57,11 +127,37 @@ class FileManager:
         else:
             self.text_dir, self.json_dir = get_current_data_dirs()
 
-        # Ensure directories exist
-        os.makedirs(self.text_dir, exist_ok=True)
-        os.makedirs(self.json_dir, exist_ok=True)
+        # Ensure directories exist (the resolved 'current' dirs were just checked)
+        validated = _resolved_dirs_cache is not None and _resolved_dirs_cache[1] == (self.text_dir, self.json_dir)
+        if not validated:
+            for directory in (self.text_dir, self.json_dir):
+                if not os.path.isdir(directory):
+                    os.makedirs(directory, exist_ok=True)
+
+        # Directory paths with a trailing separator, so file paths are a plain concatenation
+        self._text_prefix = os.path.join(self.text_dir, '')
+        self._json_prefix = os.path.join(self.json_dir, '')
+
+        logger.debug("FileManager initialized - Text: %s, JSON: %s", self.text_dir, self.json_dir)
+
+    def resolve_path(self, filename: str, folder_type: str = "text") -> str:
+        """
+        Path of a file in the text or json directory
+
+        Args:
+            filename: Bare file name (no directories, not hidden)
+            folder_type: "text" or "json"
+
+        Returns:
+            Path of the file (it may not exist)
 
-        logger.info(f"FileManager initialized - Text: {self.text_dir}, JSON: {self.json_dir}")
+        Raises:
+            ValueError: If the name could resolve outside the directory
+        """
+        if not filename or _UNSAFE_NAME.search(filename):
+            logger.warning(f"🚫 Rejected unsafe filename: {filename!r}")
+            raise ValueError(f"Invalid filename: {filename!r}")
+        return (self._text_prefix if folder_type == "text" else self._json_prefix) + filename
 
     def list_files(self, folder_type: str = "text", device_name: Optional[str] = None) -> List[Dict]:
         """
@@ -77,40 +173,62 @@ class FileManager:
         try:
             directory = self.text_dir if folder_type == "text" else self.json_dir
 
-            if not os.path.exists(directory):
+            try:
+                dir_mtime = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
                 logger.warning(f"⚠️  Directory {directory} does not exist")
                 return []
 
-            files = []
-            for filename in os.listdir(directory):
-                filepath = os.path.join(directory, filename)
-
-                # Skip directories
-                if os.path.isdir(filepath):
-                    continue
+            # Nothing added or removed since a recent scan: reuse it
+            cache_key = (directory, folder_type, device_name)
+            now = time.monotonic()
+            with _list_cache_lock:
+                cached = _list_cache.get(cache_key)
+                if cached is not None and cached[0] == dir_mtime and now - cached[1] < LIST_CACHE_TTL:
+                    _list_cache.move_to_end(cache_key)
+                    # Copies, so a caller's edits never leak into later responses
+                    return [dict(info) for info in cached[2]]
+
+            # scandir hands back the entry type from the directory read, so
+            # only files that survive the filters cost a stat
+            with os.scandir(directory) as entries:
+                file_entries = [
+                    entry for entry in entries
+                    # Filter by device if specified, then skip directories
+                    if (not device_name or entry.name.startswith(device_name)) and not entry.is_dir()
+                ]
 
-                # Filter by device if specified
-                if device_name and not filename.startswith(device_name):
-                    continue
-
-                # Get file stats
-                stat = os.stat(filepath)
-
-                files.append({
-                    'filename': filename,
-                    'filepath': filepath,
+            # Get file stats
+            if len(file_entries) > PARALLEL_STAT_THRESHOLD:
+                with ThreadPoolExecutor(max_workers=PARALLEL_STAT_WORKERS) as executor:
+                    stats = list(executor.map(os.DirEntry.stat, file_entries))
+            else:
+                stats = [entry.stat() for entry in file_entries]
+
+            dated_files = [  # (st_ctime_ns, file info) for sorting on the integer
+                (stat.st_ctime_ns, {
+                    'filename': entry.name,
+                    'filepath': entry.path,
                     'size_bytes': stat.st_size,
                     'size_kb': round(stat.st_size / 1024, 2),
-                    'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    'modified_at': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    'created_at': _iso_timestamp(stat.st_ctime_ns),
+                    'modified_at': _iso_timestamp(stat.st_mtime_ns),
                     'type': folder_type
                 })
+                for entry, stat in zip(file_entries, stats)
+            ]
 
             # Sort by created time (newest first)
-            files.sort(key=lambda x: x['created_at'], reverse=True)
+            dated_files.sort(key=operator.itemgetter(0), reverse=True)
+            files = [info for _, info in dated_files]
+            with _list_cache_lock:
+                _list_cache[cache_key] = (dir_mtime, now, files)
+                _list_cache.move_to_end(cache_key)
+                while len(_list_cache) > LIST_CACHE_MAX_ENTRIES:
+                    _list_cache.popitem(last=False)
 
-            logger.info(f"📂 Listed {len(files)} files from {folder_type} directory")
-            return files
+            logger.debug("📂 Listed %d files from %s directory", len(files), folder_type)
+            return [dict(info) for info in files]
 
         except Exception as e:
             logger.error(f"❌ Error listing files from {folder_type}: {str(e)}")
@@ -128,26 +246,28 @@ class FileManager:
             Dict with file content and metadata
         """
         try:
-            directory = self.text_dir if folder_type == "text" else self.json_dir
-            filepath = os.path.join(directory, filename)
+            filepath = self.resolve_path(filename, folder_type)
 
-            if not os.path.exists(filepath):
+            # Read file content; stats come from the open descriptor
+            try:
+                f = open(filepath, 'rb')
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {filename}")
+            with f:
+                stat = os.fstat(f.fileno())
+                # Raw read is sized from the same fstat; decode once
+                content = f.read().decode('utf-8')
+            if '\r' in content:
+                # Keep text mode's universal-newline translation
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
 
-            # Read file content
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Get file stats
-            stat = os.stat(filepath)
-
-            logger.info(f"📄 Read file: {filename} ({stat.st_size} bytes)")
+            logger.debug("📄 Read file: %s (%d bytes)", filename, stat.st_size)
 
             return {
                 'filename': filename,
                 'content': content,
                 'size_bytes': stat.st_size,
-                'lines': len(content.splitlines()),
+                'lines': content.count('\n') + (1 if content and not content.endswith('\n') else 0),
                 'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 'type': folder_type
             }
@@ -171,14 +291,15 @@ class FileManager:
             Dict with deletion status
         """
         try:
-            directory = self.text_dir if folder_type == "text" else self.json_dir
-            filepath = os.path.join(directory, filename)
+            filepath = self.resolve_path(filename, folder_type)
 
-            if not os.path.exists(filepath):
+            try:
+                os.remove(filepath)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"File not found: {filename}")
-
-            os.remove(filepath)
-            logger.info(f"🗑️  Deleted file: {filename}")
+            # Don't rely on mtime granularity to notice the removal
+            invalidate_list_cache(self.text_dir if folder_type == "text" else self.json_dir)
+            logger.info("🗑️  Deleted file: %s", filename)
 
             return {
                 'status': 'deleted',
@@ -190,6 +311,66 @@ class FileManager:
             logger.error(f"❌ Error deleting file {filename}: {str(e)}")
             raise
 
+    @staticmethod
+    def _dir_summary(directory: str) -> Tuple[int, int]:
+        """Count the files in a directory and total their size in one scandir pass"""
+        count = total_size = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        count += 1
+                        total_size += entry.stat().st_size
+        except FileNotFoundError:
+            logger.warning(f"⚠️  Directory {directory} does not exist")
+        return count, total_size
+
+    def delete_files(self, filenames: List[str], folder_type: str = "text") -> dict:
+        """
+        Delete several files in one pass
+
+        Args:
+            filenames: Names of files to delete
+            folder_type: "text" or "json"
+
+        Returns:
+            Dict with the deleted and missing filenames, plus failed
+            entries ({'filename', 'error'}) for files that could not be removed
+
+        Raises:
+            ValueError: If any name is unsafe (nothing is deleted)
+        """
+        # Validate every name before deleting anything
+        filepaths = [self.resolve_path(filename, folder_type) for filename in filenames]
+        deleted = []
+        missing = []
+        failed = []
+
+        try:
+            for filename, filepath in zip(filenames, filepaths):
+                try:
+                    os.unlink(filepath)
+                    deleted.append(filename)
+                except FileNotFoundError:
+                    missing.append(filename)
+                except OSError as e:
+                    # One bad entry (a directory, no permission) must not abort the rest
+                    logger.warning(f"⚠️  Could not delete {filename}: {e}")
+                    failed.append({'filename': filename, 'error': e.strerror or str(e)})
+        finally:
+            if deleted:
+                invalidate_list_cache(self.text_dir if folder_type == "text" else self.json_dir)
+        logger.info("🗑️  Deleted %d files from %s directory (%d not found, %d failed)",
+                    len(deleted), folder_type, len(missing), len(failed))
+
+        return {
+            'status': 'deleted' if not failed else 'partial',
+            'deleted': deleted,
+            'missing': missing,
+            'failed': failed,
+            'deleted_at': datetime.now().isoformat()
+        }
+
     def get_directory_stats(self) -> dict:
         """
         Get statistics about output directories
@@ -198,26 +379,24 @@ class FileManager:
             Dict with directory statistics
         """
         try:
-            text_files = self.list_files("text")
-            json_files = self.list_files("json")
-
-            total_text_size = sum(f['size_bytes'] for f in text_files)
-            total_json_size = sum(f['size_bytes'] for f in json_files)
+            # Only counts and sizes are needed, not the per-file dicts list_files() builds
+            text_count, total_text_size = self._dir_summary(self.text_dir)
+            json_count, total_json_size = self._dir_summary(self.json_dir)
 
             return {
                 'text_directory': {
                     'path': self.text_dir,
-                    'file_count': len(text_files),
+                    'file_count': text_count,
                     'total_size_bytes': total_text_size,
                     'total_size_mb': round(total_text_size / (1024 * 1024), 2)
                 },
                 'json_directory': {
                     'path': self.json_dir,
-                    'file_count': len(json_files),
+                    'file_count': json_count,
                     'total_size_bytes': total_json_size,
                     'total_size_mb': round(total_json_size / (1024 * 1024), 2)
                 },
-                'total_files': len(text_files) + len(json_files),
+                'total_files': text_count + json_count,
                 'total_size_mb': round((total_text_size + total_json_size) / (1024 * 1024), 2)
             }
 
@@ -226,9 +405,19 @@ class FileManager:
             raise
 
 # Global file manager instance - will auto-detect current symlink
-# Note: This is initialized once. For fresh data after automation,
+# Note: This is built on first access (not at import, when the 'current'
+# symlink may not exist yet) and then kept. For fresh data after automation,
 # the API endpoint should create a new FileManager instance.
-file_manager = FileManager()
+_file_manager: Optional[FileManager] = None
+
+
+def __getattr__(name: str):
+    global _file_manager
+    if name == 'file_manager':
+        if _file_manager is None:
+            _file_manager = FileManager()
+        return _file_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_file_manager():
@@ -4,21 +4,38 @@ Parses collected interface data and builds interface capacity/traffic database.
 Also correlates CDP neighbors for physical topology discovery.
 """
 
+import atexit
 import os
+import queue
 import re
 import json
-import uuid
 import logging
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 import sqlite3
 
 logger = logging.getLogger(__name__)
 
+# Try to import orjson for faster JSON parsing, fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Backend directory
 BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TOPOLOGY_DB = os.path.join(BACKEND_DIR, "topology.db")
 
+# Upper bound on threads used to read/parse JSON files in parallel
+PARSE_MAX_WORKERS = 16
+
 # Interface name normalization mappings (full form → abbreviated form)
 # This ensures that "GigabitEthernet0/0/0/0" and "Gi0/0/0/0" are treated as the same interface
 INTERFACE_NORMALIZATION_MAP = {
@@ -34,6 +51,397 @@ INTERFACE_NORMALIZATION_MAP = {
     "BUNDLE-ETHER": "BE",
     "NULL": "Nu",
 }
+# One anchored alternation over the map keys (longest first) instead of a startswith loop
+_NORM_RE = re.compile(
+    r'^(' + '|'.join(re.escape(k) for k in sorted(INTERFACE_NORMALIZATION_MAP, key=len, reverse=True)) + r')',
+    re.IGNORECASE,
+)
+
+# Compiled once: used for every interface name / OSPF brief line
+_HOLDTIME_RE = re.compile(r'Holdtime.*', re.IGNORECASE)
+_CAPABILITY_RE = re.compile(r'Capability.*', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_CTRL_DELETE = str.maketrans('', '', '\n\r\t')
+# Transform input kind from the command in a JSON filename:
+# show_interface*/show_int* (full interface data), show_ospf_interface_brief
+# (fallback source), show_cdp*, show_bundle* (LAG data); show_ospf_interface
+# without _brief matches nothing, so it never counts as full interface data
+_FILE_KIND_RE = re.compile(r'show_(ospf_interface_brief|interface|int|cdp|bundle)')
+# Interface  PID  Area  IP Address/Mask  Cost  State  Nbrs F/C
+# Scanned over the whole output with finditer: one match per interface line,
+# columns kept on one line ([ \t]+), header and '*'/'-' lines never match
+_OSPF_BRIEF_LINE_RE = re.compile(
+    r'^[ \t]*([^\s*\-]\S*)[ \t]+(\d+)[ \t]+(\S+)[ \t]+(\d+\.\d+\.\d+\.\d+/\d+)[ \t]+(\d+)[ \t]+(\S+)[ \t]+(\d+/\d+)',
+    re.MULTILINE,
+)
+
+# Column order for the batched INSERTs below
+INTERFACE_COLUMNS = (
+    "id", "router", "interface", "description", "admin_status", "line_protocol",
+    "bw_kbps", "capacity_class", "input_rate_bps", "output_rate_bps",
+    "input_utilization_pct", "output_utilization_pct", "mac_address", "mtu",
+    "encapsulation", "is_physical", "parent_interface", "neighbor_router",
+    "neighbor_interface", "updated_at",
+)
+CDP_COLUMNS = (
+    "id", "local_router", "local_interface", "remote_router", "remote_interface",
+    "remote_platform", "remote_ip", "updated_at",
+)
+
+INSERT_INTERFACE_SQL = (
+    f"INSERT OR REPLACE INTO interface_capacity ({', '.join(INTERFACE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(INTERFACE_COLUMNS))})"
+)
+# Same insert fed by one JSON array of rows, unpacked inside SQLite by json_each
+# (JSON1 is built in from SQLite 3.38; older builds use INSERT_INTERFACE_SQL)
+SQLITE_HAS_JSON1 = sqlite3.sqlite_version_info >= (3, 38, 0)
+INSERT_INTERFACE_JSON_SQL = (
+    f"INSERT OR REPLACE INTO interface_capacity ({', '.join(INTERFACE_COLUMNS)}) "
+    "SELECT " + ", ".join("json_extract(value, '$[%d]')" % i for i in range(len(INTERFACE_COLUMNS)))
+    + " FROM json_each(?)"
+)
+INSERT_CDP_SQL = (
+    f"INSERT OR REPLACE INTO cdp_neighbors ({', '.join(CDP_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(CDP_COLUMNS))})"
+)
+
+
+@dataclass(slots=True)
+class InterfaceRecord:
+    """One interface_capacity row (plus OSPF brief extras that are not stored)"""
+    id: str
+    router: str
+    interface: str
+    description: str = ""
+    admin_status: str = "unknown"
+    line_protocol: str = "unknown"
+    bw_kbps: int = 0
+    capacity_class: Optional[str] = None
+    input_rate_bps: int = 0
+    output_rate_bps: int = 0
+    input_utilization_pct: float = 0
+    output_utilization_pct: float = 0
+    mac_address: str = ""
+    mtu: int = 0
+    encapsulation: str = ""
+    is_physical: int = 1
+    parent_interface: Optional[str] = None
+    neighbor_router: Optional[str] = None
+    neighbor_interface: Optional[str] = None
+    updated_at: Optional[str] = None
+    ospf_cost: Optional[int] = None
+    ip_address: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CdpNeighborRecord:
+    """One cdp_neighbors row"""
+    id: str
+    local_router: str
+    local_interface: str
+    remote_router: str
+    remote_interface: str = ""
+    remote_platform: str = ""
+    remote_ip: str = ""
+    updated_at: Optional[str] = None
+
+
+# Record -> bind tuple in column order, without dataclasses.astuple's deep copy
+_interface_row = operator.attrgetter(*INTERFACE_COLUMNS)
+_cdp_row = operator.attrgetter(*CDP_COLUMNS)
+
+# Read side of the mv_interface_summary roll-up (see _refresh_interface_summary)
+SELECT_INTERFACE_SUMMARY_SQL = (
+    "SELECT capacity_class, router, total, physical, high_utilization, refreshed_at "
+    "FROM mv_interface_summary ORDER BY capacity_class"
+)
+
+
+# Capacity class by interface type prefix (see _get_capacity_from_interface_type_cached)
+# Bundle-Ether (BE) is a LAG aggregate: without show bundle data its capacity is unknown
+_CAPACITY_BY_PREFIX = {
+    "HU": "100G",
+    "FO": "40G",
+    "TF": "25G",
+    "TE": "10G",
+    "GI": "1G",
+    "FA": "100M",
+    "BE": "LAG",
+    "LO": "1G",
+}
+_CAPACITY_BY_LONG_FORM = (("TWENTYFIVEGIGE", "25G"), ("BUNDLE-ETHER", "LAG"))
+
+# Pure name helpers, memoized at module level: the same few dozen interface
+# names repeat across every device and again during CDP correlation
+@lru_cache(maxsize=8192)
+def _normalize_interface_name_cached(interface: str) -> str:
+    """
+    Normalize interface name to canonical abbreviated form.
+
+    This ensures that "GigabitEthernet0/0/0/0" and "Gi0/0/0/0" are stored
+    as the same interface, preventing duplicates in the database.
+
+    Also cleans garbage like "\nHoldtime" from CDP parsing issues.
+
+    Examples:
+        GigabitEthernet0/0/0/0 → Gi0/0/0/0
+        Loopback0 → Lo0
+        MgmtEth0/RP0/CPU0/0 → Mg0/RP0/CPU0/0
+        Bundle-Ether400 → BE400
+        Null0 → Nu0
+        FastEthernet1/0\nHoldtime → Fa1/0
+    """
+    if not interface:
+        return interface
+
+    # CRITICAL: Clean garbage from interface names (CDP parsing issues)
+    # Remove newlines, carriage returns, tabs
+    interface = interface.translate(_CTRL_DELETE)
+
+    # Remove "Holdtime" and other CDP garbage that might leak through
+    interface = _HOLDTIME_RE.sub('', interface)
+    interface = _CAPABILITY_RE.sub('', interface)
+
+    # Remove extra spaces between interface type and number
+    interface = _WHITESPACE_RE.sub('', interface)
+
+    # Strip leading/trailing whitespace
+    interface = interface.strip()
+
+    if not interface:
+        return ""
+
+    # Handle subinterfaces by normalizing the parent part
+    subintf_suffix = ""
+    if "." in interface:
+        parts = interface.split(".", 1)
+        interface = parts[0]
+        subintf_suffix = "." + parts[1]
+
+    # Check against normalization map (case-insensitive)
+    match = _NORM_RE.match(interface)
+    if match:
+        # Replace the full form with abbreviated form
+        abbrev = INTERFACE_NORMALIZATION_MAP[match.group(1).upper()]
+        return abbrev + interface[match.end():] + subintf_suffix
+
+    # Return original if no normalization needed
+    return interface + subintf_suffix
+
+
+@lru_cache(maxsize=8192)
+def _is_physical_interface_cached(interface: str) -> bool:
+    """Check if interface is physical (not subinterface/bundle member)"""
+    # Subinterfaces contain "."
+    if "." in interface:
+        return False
+    # Bundle-Ether members
+    if interface.startswith("BE") and "/" in interface:
+        return False
+    return True
+
+
+@lru_cache(maxsize=8192)
+def _get_parent_interface_cached(interface: str) -> Optional[str]:
+    """Get parent interface for subinterfaces"""
+    if "." in interface:
+        return interface.split(".")[0]
+    return None
+
+
+@lru_cache(maxsize=8192)
+def _get_capacity_from_interface_type_cached(interface: str) -> str:
+    """
+    Get capacity class DIRECTLY from IOS-XR interface type designation.
+
+    Uses interface naming convention - no bandwidth calculations:
+    - HundredGigE / Hu = 100G
+    - TenGigE / Te = 10G
+    - GigabitEthernet / Gi = 1G
+    - FastEthernet / Fa = 100M
+    - Bundle-Ether / BE = 10G (default for LAG)
+    """
+    intf = interface.upper()
+
+    # Short form (Hu, Fo, Tf, Te, Gi, Fa, BE, Lo) - also the first two letters
+    # of every long form except TwentyFiveGigE and Bundle-Ether
+    capacity = _CAPACITY_BY_PREFIX.get(intf[:2])
+    if capacity is not None:
+        return capacity
+
+    for long_form, capacity in _CAPACITY_BY_LONG_FORM:
+        if intf.startswith(long_form):
+            return capacity
+
+    # Unknown type defaults to 1G
+    return "1G"
+
+@lru_cache(maxsize=8192)
+def _get_hardware_interface_bandwidth_cached(interface: str) -> int:
+    """Get bandwidth in kbps based on interface type designation."""
+    capacity = _get_capacity_from_interface_type_cached(interface)
+    bandwidth_map = {
+        "100G": 100000000,
+        "40G": 40000000,
+        "25G": 25000000,
+        "10G": 10000000,
+        "1G": 1000000,
+        "100M": 100000,
+        "10M": 10000,
+        "LAG": 0,  # LAG bandwidth unknown without show bundle data
+    }
+    return bandwidth_map.get(capacity, 1000000)
+
+
+# Per-connection tuning for topology.db: WAL lets readers run alongside the
+# transform's writer and, with synchronous=NORMAL, syncs at checkpoints
+# instead of on every commit
+TOPOLOGY_DB_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+)
+_wal_enabled = False
+# Reader connections kept open for get_interface_summary / get_traffic_matrix
+TOPOLOGY_POOL_READERS = 4
+
+
+def _open_conn(db_path: str = None) -> sqlite3.Connection:
+    """Open a TOPOLOGY_DB connection with WAL and the tuned PRAGMAs applied"""
+    global _wal_enabled
+    # Pooled connections are used from whichever thread checks them out
+    conn = sqlite3.connect(db_path or TOPOLOGY_DB, check_same_thread=False)
+    if not _wal_enabled:
+        # journal_mode is stored in the database file, so once per process is enough
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            _wal_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"⚠️  Could not switch topology DB to WAL: {e}")
+    for pragma in TOPOLOGY_DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class TopologyConnPool:
+    """
+    Reusable TOPOLOGY_DB connections: one serialized writer plus a few readers
+
+    Connections stay open between calls, so SQLite keeps its page cache and
+    parsed schema instead of rebuilding them for every request. Readers are
+    opened on demand up to max_readers and handed out through a queue; the
+    single writer is guarded by a lock (SQLite only allows one writer at a
+    time anyway). close() runs at exit.
+    """
+
+    def __init__(self, db_path: str, max_readers: int = TOPOLOGY_POOL_READERS):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self._readers: queue.Queue = queue.Queue()
+        self._reader_count = 0
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        """Take an idle reader, open a new one below the limit, or wait for one"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._reader_count < self.max_readers
+            if can_open:
+                self._reader_count += 1
+        if not can_open:
+            return self._readers.get()
+
+        try:
+            conn = _open_conn(self.db_path)
+        except Exception:
+            with self._lock:
+                self._reader_count -= 1
+            raise
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def get_read(self):
+        """Check out a reader connection (rows come back as sqlite3.Row)"""
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def get_write(self):
+        """Hold the writer connection; a transaction left open is rolled back"""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = _open_conn(self.db_path)
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+
+    def close(self):
+        """Close the idle readers and the writer"""
+        while True:
+            try:
+                conn = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._reader_count -= 1
+
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_pool: Optional[TopologyConnPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> TopologyConnPool:
+    """Get the shared TOPOLOGY_DB connection pool, created on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = TopologyConnPool(TOPOLOGY_DB)
+    return _pool
+
+
+def _dump_json(obj) -> str:
+    """Encode obj as a JSON string, with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _load_json(filepath: str):
+    """Read and decode a JSON file, with orjson when available"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # stdlib json also accepts NaN/Infinity, which json.dump can write
+            pass
+    return json.loads(raw)
 
 
 class InterfaceTransformer:
@@ -72,20 +480,20 @@ class InterfaceTransformer:
         """
         logger.info("🔄 Starting interface transformation...")
 
+        # One timestamp for the whole run, stamped on every record as updated_at
+        run_ts = datetime.now().isoformat()
+
         results = {
             "interfaces_processed": 0,
             "cdp_neighbors_processed": 0,
             "devices_processed": [],
             "errors": [],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": run_ts
         }
 
         try:
             # Find all JSON files with interface data
-            interface_files = self._find_interface_files()
-            ospf_interface_files = self._find_ospf_interface_files()
-            cdp_files = self._find_cdp_files()
-            bundle_files = self._find_bundle_files()
+            interface_files, ospf_interface_files, cdp_files, bundle_files = self._scan_json_dir(valid_devices)
 
             logger.info(f"📂 Found {len(interface_files)} interface files, {len(ospf_interface_files)} OSPF interface files, {len(cdp_files)} CDP files, {len(bundle_files)} bundle files")
 
@@ -97,57 +505,45 @@ class InterfaceTransformer:
             all_interfaces = []
 
             # First try full interface files
-            for filepath in interface_files:
-                try:
-                    device_name = self._extract_device_name(filepath)
-                    if valid_devices and device_name not in valid_devices:
-                        continue
-
-                    interfaces = self._parse_interface_file(filepath, device_name)
-                    all_interfaces.extend(interfaces)
+            for filepath, device_name, interfaces, error in self._parse_files(
+                    interface_files, self._parse_interface_file, run_ts):
+                if error is not None:
+                    logger.error(f"Error processing {filepath}: {error}")
+                    results["errors"].append(f"{filepath}: {str(error)}")
+                    continue
 
-                    if device_name not in results["devices_processed"]:
-                        results["devices_processed"].append(device_name)
+                all_interfaces.extend(interfaces)
 
-                except Exception as e:
-                    logger.error(f"Error processing {filepath}: {e}")
-                    results["errors"].append(f"{filepath}: {str(e)}")
+                if device_name not in results["devices_processed"]:
+                    results["devices_processed"].append(device_name)
 
             # If no interface data found, use OSPF interface brief as fallback
             if not all_interfaces and ospf_interface_files:
                 logger.info("🔄 No full interface files found, using OSPF interface brief as fallback...")
                 results["source"] = "ospf_interface_brief_fallback"
 
-                for filepath in ospf_interface_files:
-                    try:
-                        device_name = self._extract_device_name(filepath)
-                        if valid_devices and device_name not in valid_devices:
-                            continue
-
-                        interfaces = self._parse_ospf_interface_file(filepath, device_name)
-                        all_interfaces.extend(interfaces)
+                for filepath, device_name, interfaces, error in self._parse_files(
+                        ospf_interface_files, self._parse_ospf_interface_file, run_ts):
+                    if error is not None:
+                        logger.error(f"Error processing OSPF interface {filepath}: {error}")
+                        results["errors"].append(f"OSPF {filepath}: {str(error)}")
+                        continue
 
-                        if device_name not in results["devices_processed"]:
-                            results["devices_processed"].append(device_name)
+                    all_interfaces.extend(interfaces)
 
-                    except Exception as e:
-                        logger.error(f"Error processing OSPF interface {filepath}: {e}")
-                        results["errors"].append(f"OSPF {filepath}: {str(e)}")
+                    if device_name not in results["devices_processed"]:
+                        results["devices_processed"].append(device_name)
 
             # Process CDP files
             all_cdp_neighbors = []
-            for filepath in cdp_files:
-                try:
-                    device_name = self._extract_device_name(filepath)
-                    if valid_devices and device_name not in valid_devices:
-                        continue
-
-                    neighbors = self._parse_cdp_file(filepath, device_name)
-                    all_cdp_neighbors.extend(neighbors)
+            for filepath, device_name, neighbors, error in self._parse_files(
+                    cdp_files, self._parse_cdp_file, run_ts):
+                if error is not None:
+                    logger.error(f"Error processing CDP {filepath}: {error}")
+                    results["errors"].append(f"CDP {filepath}: {str(error)}")
+                    continue
 
-                except Exception as e:
-                    logger.error(f"Error processing CDP {filepath}: {e}")
-                    results["errors"].append(f"CDP {filepath}: {str(e)}")
+                all_cdp_neighbors.extend(neighbors)
 
             # Correlate interfaces with CDP neighbors
             self._correlate_interfaces_with_cdp(all_interfaces, all_cdp_neighbors)
@@ -168,57 +564,76 @@ class InterfaceTransformer:
             results["errors"].append(str(e))
             return results
 
-    def _find_interface_files(self) -> List[str]:
-        """Find JSON files containing interface data"""
-        files = []
-        if not os.path.exists(self.json_dir):
-            return files
+    def _scan_json_dir(self, valid_devices: List[str] = None) -> Tuple[List[str], List[str], List[str], List[str]]:
+        """
+        Scan the JSON directory once and sort files into the four input kinds.
+
+        Files of devices outside valid_devices are dropped here, by filename,
+        so they are never opened or decoded.
 
-        for filename in os.listdir(self.json_dir):
-            if filename.endswith(".json"):
-                # Match: show_interface_*.json or show_int_*.json (full interface data)
-                if "show_interface" in filename or "show_int" in filename:
-                    # Exclude show_ospf_interface_brief - handle separately
-                    if "show_ospf_interface" not in filename:
-                        files.append(os.path.join(self.json_dir, filename))
+        Args:
+            valid_devices: List of device names to keep (None = all)
 
-        return files
+        Returns:
+            (interface_files, ospf_interface_files, cdp_files, bundle_files)
+        """
+        interface_files, ospf_files, cdp_files, bundle_files = [], [], [], []
+        buckets = {
+            "interface": interface_files,
+            "int": interface_files,
+            "ospf_interface_brief": ospf_files,
+            "cdp": cdp_files,
+            "bundle": bundle_files,
+        }
+        wanted = frozenset(valid_devices) if valid_devices else None
 
-    def _find_ospf_interface_files(self) -> List[str]:
-        """Find JSON files containing OSPF interface brief data (fallback source)"""
-        files = []
-        if not os.path.exists(self.json_dir):
-            return files
+        try:
+            with os.scandir(self.json_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".json"):
+                        continue
+                    # Same rule as _extract_device_name: devicename_command_timestamp.json
+                    if wanted is not None and name.partition("_")[0] not in wanted:
+                        continue
 
-        for filename in os.listdir(self.json_dir):
-            if filename.endswith(".json") and "show_ospf_interface_brief" in filename:
-                files.append(os.path.join(self.json_dir, filename))
+                    # One search classifies the file by its show command
+                    match = _FILE_KIND_RE.search(name)
+                    if match:
+                        buckets[match.group(1)].append(entry.path)
+        except FileNotFoundError:
+            pass
 
-        return files
+        return interface_files, ospf_files, cdp_files, bundle_files
 
-    def _find_cdp_files(self) -> List[str]:
-        """Find JSON files containing CDP data"""
-        files = []
-        if not os.path.exists(self.json_dir):
-            return files
+    def _parse_files(self, files: List[str], parse, updated_at: str = None) -> List[Tuple]:
+        """
+        Run a per-file parser over files on a thread pool.
 
-        for filename in os.listdir(self.json_dir):
-            if filename.endswith(".json") and "show_cdp" in filename:
-                files.append(os.path.join(self.json_dir, filename))
+        File reads and JSON decoding release the GIL, so several files are
+        parsed at once; results come back in input order.
 
-        return files
+        Args:
+            files: JSON file paths
+            parse: Parser taking (filepath, device_name, updated_at) and returning records
+            updated_at: Timestamp stamped on every record of this run
 
-    def _find_bundle_files(self) -> List[str]:
-        """Find JSON files containing bundle (LAG) data"""
-        files = []
-        if not os.path.exists(self.json_dir):
-            return files
+        Returns:
+            List of (filepath, device_name, records, error) tuples; error is
+            set (and records None) if the file failed
+        """
+        def parse_one(filepath: str) -> Tuple:
+            try:
+                device_name = self._extract_device_name(filepath)
+                return filepath, device_name, parse(filepath, device_name, updated_at), None
+            except Exception as e:
+                return filepath, None, None, e
 
-        for filename in os.listdir(self.json_dir):
-            if filename.endswith(".json") and "show_bundle" in filename:
-                files.append(os.path.join(self.json_dir, filename))
+        if len(files) < 2:
+            return [parse_one(filepath) for filepath in files]
 
-        return files
+        with ThreadPoolExecutor(max_workers=min(PARSE_MAX_WORKERS, len(files))) as executor:
+            return list(executor.map(parse_one, files))
 
     def _load_bundle_data(self, bundle_files: List[str]):
         """
@@ -231,8 +646,7 @@ class InterfaceTransformer:
             try:
                 device_name = self._extract_device_name(filepath)
 
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
+                data = _load_json(filepath)
 
                 parsed = data.get("parsed_data", {})
                 bundles = parsed.get("bundles", [])
@@ -253,112 +667,54 @@ class InterfaceTransformer:
                     }
 
                     # Store with full name
-                    self.bundle_data[(device_name, bundle_name.upper())] = bundle_info
+                    name_upper = bundle_name.upper()
+                    self.bundle_data[(device_name, name_upper)] = bundle_info
 
                     # Also store with alternate naming
-                    if bundle_name.upper().startswith("BUNDLE-ETHER"):
+                    if name_upper.startswith("BUNDLE-ETHER"):
                         # Also key by BE<num>
-                        num = bundle_name.upper().replace("BUNDLE-ETHER", "")
-                        self.bundle_data[(device_name, f"BE{num}")] = bundle_info
-                    elif bundle_name.upper().startswith("BE"):
+                        self.bundle_data[(device_name, "BE" + name_upper[12:])] = bundle_info
+                    elif name_upper.startswith("BE"):
                         # Also key by Bundle-Ether<num>
-                        num = bundle_name.upper().replace("BE", "")
-                        self.bundle_data[(device_name, f"BUNDLE-ETHER{num}")] = bundle_info
+                        self.bundle_data[(device_name, "BUNDLE-ETHER" + name_upper[2:])] = bundle_info
 
                     logger.debug(f"Loaded bundle {bundle_name} for {device_name}: {bundle_info['capacity_class']}")
 
             except Exception as e:
                 logger.error(f"Error loading bundle data from {filepath}: {e}")
 
-    def _get_bundle_capacity(self, device_name: str, interface: str) -> Optional[str]:
+    def _get_bundle_capacity(self, device_name: str, hw_upper: str) -> Optional[str]:
         """
         Get capacity class for a Bundle-Ether interface from loaded bundle data.
         Returns None if no bundle data is found.
-        """
-        intf_upper = interface.upper()
-
-        # Handle subinterfaces (e.g., BE200.100 -> BE200)
-        if "." in intf_upper:
-            intf_upper = intf_upper.split(".")[0]
 
-        key = (device_name, intf_upper)
-        if key in self.bundle_data:
-            return self.bundle_data[key]["capacity_class"]
+        Args:
+            device_name: Router the interface belongs to
+            hw_upper: Uppercased bundle name without subinterface suffix
+                      (callers pass the parent of BE200.100, i.e. "BE200")
+        """
+        bundle_info = self.bundle_data.get((device_name, hw_upper))
+        if bundle_info is not None:
+            return bundle_info["capacity_class"]
 
         return None
 
     def _extract_device_name(self, filepath: str) -> str:
         """Extract device name from filename"""
-        filename = os.path.basename(filepath)
         # Format: devicename_command_timestamp.json
-        parts = filename.split("_")
-        if parts:
-            return parts[0]
-        return "unknown"
+        return os.path.basename(filepath).partition("_")[0]
 
     def _normalize_interface_name(self, interface: str) -> str:
-        """
-        Normalize interface name to canonical abbreviated form.
-
-        This ensures that "GigabitEthernet0/0/0/0" and "Gi0/0/0/0" are stored
-        as the same interface, preventing duplicates in the database.
+        """Forwards to the memoized module-level _normalize_interface_name_cached()"""
+        return _normalize_interface_name_cached(interface)
 
-        Also cleans garbage like "\nHoldtime" from CDP parsing issues.
-
-        Examples:
-            GigabitEthernet0/0/0/0 → Gi0/0/0/0
-            Loopback0 → Lo0
-            MgmtEth0/RP0/CPU0/0 → Mg0/RP0/CPU0/0
-            Bundle-Ether400 → BE400
-            Null0 → Nu0
-            FastEthernet1/0\nHoldtime → Fa1/0
-        """
-        if not interface:
-            return interface
-
-        # CRITICAL: Clean garbage from interface names (CDP parsing issues)
-        # Remove newlines, carriage returns, tabs
-        interface = interface.replace('\n', '').replace('\r', '').replace('\t', '')
-
-        # Remove "Holdtime" and other CDP garbage that might leak through
-        interface = re.sub(r'Holdtime.*', '', interface, flags=re.IGNORECASE)
-        interface = re.sub(r'Capability.*', '', interface, flags=re.IGNORECASE)
-
-        # Remove extra spaces between interface type and number
-        interface = re.sub(r'\s+', '', interface)
-
-        # Strip leading/trailing whitespace
-        interface = interface.strip()
-
-        if not interface:
-            return ""
-
-        # Handle subinterfaces by normalizing the parent part
-        subintf_suffix = ""
-        if "." in interface:
-            parts = interface.split(".", 1)
-            interface = parts[0]
-            subintf_suffix = "." + parts[1]
-
-        # Check against normalization map (case-insensitive)
-        intf_upper = interface.upper()
-
-        for full_form, abbrev in INTERFACE_NORMALIZATION_MAP.items():
-            if intf_upper.startswith(full_form):
-                # Replace the full form with abbreviated form
-                remainder = interface[len(full_form):]
-                return abbrev + remainder + subintf_suffix
-
-        # Return original if no normalization needed
-        return interface + subintf_suffix
-
-    def _parse_interface_file(self, filepath: str, device_name: str) -> List[Dict]:
+    def _parse_interface_file(self, filepath: str, device_name: str, updated_at: str = None) -> List[InterfaceRecord]:
         """Parse interface JSON file and extract interface data"""
+        updated_at = updated_at or datetime.now().isoformat()
         interfaces = []
 
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = _load_json(filepath)
 
             parsed = data.get("parsed_data", {})
             if not parsed.get("parsed"):
@@ -377,8 +733,9 @@ class InterfaceTransformer:
                 # Determine capacity class
                 # For Bundle-Ether (LAG), check bundle data first for actual capacity
                 hw_interface = parent if parent else intf_name
-                if hw_interface.upper().startswith(("BUNDLE-ETHER", "BE")):
-                    bundle_capacity = self._get_bundle_capacity(device_name, hw_interface)
+                hw_upper = hw_interface.upper()
+                if hw_upper.startswith(("BUNDLE-ETHER", "BE")):
+                    bundle_capacity = self._get_bundle_capacity(device_name, hw_upper)
                     if bundle_capacity:
                         capacity_class = bundle_capacity
                     else:
@@ -386,26 +743,27 @@ class InterfaceTransformer:
                 else:
                     capacity_class = intf.get("capacity_class", self._determine_capacity_class(intf.get("bw_kbps", 0), intf_name))
 
-                interface_record = {
-                    "id": str(uuid.uuid4()),
-                    "router": device_name,
-                    "interface": intf_name,
-                    "description": intf.get("description", ""),
-                    "admin_status": intf.get("admin_status", intf.get("state", "unknown")),
-                    "line_protocol": intf.get("line_protocol", intf.get("protocol", "unknown")),
-                    "bw_kbps": intf.get("bw_kbps", 0),
-                    "capacity_class": capacity_class,
-                    "input_rate_bps": intf.get("input_rate_bps", 0),
-                    "output_rate_bps": intf.get("output_rate_bps", 0),
-                    "input_utilization_pct": intf.get("input_utilization_pct", 0),
-                    "output_utilization_pct": intf.get("output_utilization_pct", 0),
-                    "mac_address": intf.get("mac_address", ""),
-                    "mtu": intf.get("mtu", 0),
-                    "encapsulation": intf.get("encap", ""),
-                    "is_physical": 1 if is_physical else 0,
-                    "parent_interface": parent,
-                    "updated_at": datetime.now().isoformat()
-                }
+                interface_record = InterfaceRecord(
+                    # Natural key as id (same as UNIQUE(router, interface)), no per-row uuid4
+                    id=f"{device_name}|{intf_name}",
+                    router=device_name,
+                    interface=intf_name,
+                    description=intf.get("description", ""),
+                    admin_status=intf.get("admin_status", intf.get("state", "unknown")),
+                    line_protocol=intf.get("line_protocol", intf.get("protocol", "unknown")),
+                    bw_kbps=intf.get("bw_kbps", 0),
+                    capacity_class=capacity_class,
+                    input_rate_bps=intf.get("input_rate_bps", 0),
+                    output_rate_bps=intf.get("output_rate_bps", 0),
+                    input_utilization_pct=intf.get("input_utilization_pct", 0),
+                    output_utilization_pct=intf.get("output_utilization_pct", 0),
+                    mac_address=intf.get("mac_address", ""),
+                    mtu=intf.get("mtu", 0),
+                    encapsulation=intf.get("encap", ""),
+                    is_physical=1 if is_physical else 0,
+                    parent_interface=parent,
+                    updated_at=updated_at
+                )
 
                 interfaces.append(interface_record)
 
@@ -414,13 +772,13 @@ class InterfaceTransformer:
 
         return interfaces
 
-    def _parse_ospf_interface_file(self, filepath: str, device_name: str) -> List[Dict]:
+    def _parse_ospf_interface_file(self, filepath: str, device_name: str, updated_at: str = None) -> List[InterfaceRecord]:
         """Parse OSPF interface brief JSON file (fallback source for basic interface data)"""
+        updated_at = updated_at or datetime.now().isoformat()
         interfaces = []
 
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = _load_json(filepath)
 
             # Parse from raw_output since parsed_data is usually empty
             raw_output = data.get("raw_output", "")
@@ -432,73 +790,66 @@ class InterfaceTransformer:
             # Lo0                1     0               172.16.10.10/32    1     LOOP  0/0
             # Gi0/0/0/1          1     0               172.13.0.37/30     600   DR    1/1
 
-            lines = raw_output.strip().split('\n')
-            for line in lines:
-                # Skip header and empty lines
-                if not line.strip() or 'Interface' in line and 'PID' in line:
-                    continue
-                if line.startswith('*') or line.startswith('-'):
-                    continue
+            # Per-line work calls the memoized helpers directly (no method forwarder frame)
+            normalize = _normalize_interface_name_cached
+            is_physical_interface = _is_physical_interface_cached
+            get_parent_interface = _get_parent_interface_cached
+            capacity_from_type = _get_capacity_from_interface_type_cached
+            hardware_bandwidth = _get_hardware_interface_bandwidth_cached
 
-                # Parse the interface line using regex
-                # Format: Interface(space)PID(space)Area(space)IP/Mask(space)Cost(space)State(space)Nbrs
-                match = re.match(
-                    r'^(\S+)\s+(\d+)\s+(\S+)\s+(\d+\.\d+\.\d+\.\d+/\d+)\s+(\d+)\s+(\S+)\s+(\d+/\d+)',
-                    line.strip()
-                )
-                if match:
-                    intf_name = match.group(1)
-                    # Normalize interface name to prevent duplicates (e.g., Gi0/0/0/0 vs GigabitEthernet0/0/0/0)
-                    intf_name = self._normalize_interface_name(intf_name)
-                    ip_mask = match.group(4)
-                    cost = int(match.group(5))
-                    state = match.group(6)
-
-                    is_physical = self._is_physical_interface(intf_name)
-                    parent = self._get_parent_interface(intf_name) if not is_physical else None
-
-                    # Get capacity from HARDWARE interface type (NOT from OSPF cost)
-                    # For subinterfaces, use parent physical interface type
-                    hw_interface = parent if parent else intf_name
-
-                    # For Bundle-Ether (LAG), check bundle data first for actual capacity
-                    # based on active member physical interfaces
-                    if hw_interface.upper().startswith(("BUNDLE-ETHER", "BE")):
-                        bundle_capacity = self._get_bundle_capacity(device_name, hw_interface)
-                        if bundle_capacity:
-                            capacity_class = bundle_capacity
-                        else:
-                            # No bundle data available - mark as LAG (unknown)
-                            capacity_class = "LAG"
+            for match in _OSPF_BRIEF_LINE_RE.finditer(raw_output):
+                # Normalize interface name to prevent duplicates (e.g., Gi0/0/0/0 vs GigabitEthernet0/0/0/0)
+                intf_name = normalize(match.group(1))
+                ip_mask = match.group(4)
+                cost = int(match.group(5))
+                state = match.group(6)
+
+                is_physical = is_physical_interface(intf_name)
+                parent = get_parent_interface(intf_name) if not is_physical else None
+
+                # Get capacity from HARDWARE interface type (NOT from OSPF cost)
+                # For subinterfaces, use parent physical interface type
+                hw_interface = parent if parent else intf_name
+
+                # For Bundle-Ether (LAG), check bundle data first for actual capacity
+                # based on active member physical interfaces
+                hw_upper = hw_interface.upper()
+                if hw_upper.startswith(("BUNDLE-ETHER", "BE")):
+                    bundle_capacity = self._get_bundle_capacity(device_name, hw_upper)
+                    if bundle_capacity:
+                        capacity_class = bundle_capacity
                     else:
-                        capacity_class = self._get_capacity_from_interface_type(hw_interface)
-
-                    hw_bw_kbps = self._get_hardware_interface_bandwidth(hw_interface)
-
-                    interface_record = {
-                        "id": str(uuid.uuid4()),
-                        "router": device_name,
-                        "interface": intf_name,
-                        "description": f"OSPF Area {match.group(3)} - {ip_mask}",
-                        "admin_status": "up" if state != "DOWN" else "down",
-                        "line_protocol": "up" if state in ("DR", "BDR", "DROTHER", "P2P", "LOOP", "WAIT") else "down",
-                        "bw_kbps": hw_bw_kbps,
-                        "capacity_class": capacity_class,
-                        "input_rate_bps": 0,  # Not available from OSPF brief
-                        "output_rate_bps": 0,  # Not available from OSPF brief
-                        "input_utilization_pct": 0,
-                        "output_utilization_pct": 0,
-                        "mac_address": "",
-                        "mtu": 0,
-                        "encapsulation": "",
-                        "is_physical": 1 if is_physical else 0,
-                        "parent_interface": parent,
-                        "ospf_cost": cost,  # Extra: store OSPF cost
-                        "ip_address": ip_mask.split('/')[0],
-                        "updated_at": datetime.now().isoformat()
-                    }
+                        # No bundle data available - mark as LAG (unknown)
+                        capacity_class = "LAG"
+                else:
+                    capacity_class = capacity_from_type(hw_interface)
+
+                hw_bw_kbps = hardware_bandwidth(hw_interface)
+
+                interface_record = InterfaceRecord(
+                    id=f"{device_name}|{intf_name}",
+                    router=device_name,
+                    interface=intf_name,
+                    description=f"OSPF Area {match.group(3)} - {ip_mask}",
+                    admin_status="up" if state != "DOWN" else "down",
+                    line_protocol="up" if state in ("DR", "BDR", "DROTHER", "P2P", "LOOP", "WAIT") else "down",
+                    bw_kbps=hw_bw_kbps,
+                    capacity_class=capacity_class,
+                    input_rate_bps=0,  # Not available from OSPF brief
+                    output_rate_bps=0,  # Not available from OSPF brief
+                    input_utilization_pct=0,
+                    output_utilization_pct=0,
+                    mac_address="",
+                    mtu=0,
+                    encapsulation="",
+                    is_physical=1 if is_physical else 0,
+                    parent_interface=parent,
+                    ospf_cost=cost,  # Extra: store OSPF cost
+                    ip_address=ip_mask.split('/')[0],
+                    updated_at=updated_at
+                )
 
-                    interfaces.append(interface_record)
+                interfaces.append(interface_record)
 
             logger.info(f"Parsed {len(interfaces)} interfaces from OSPF brief: {device_name}")
 
@@ -507,13 +858,13 @@ class InterfaceTransformer:
 
         return interfaces
 
-    def _parse_cdp_file(self, filepath: str, device_name: str) -> List[Dict]:
+    def _parse_cdp_file(self, filepath: str, device_name: str, updated_at: str = None) -> List[CdpNeighborRecord]:
         """Parse CDP JSON file and extract neighbor data"""
+        updated_at = updated_at or datetime.now().isoformat()
         neighbors = []
 
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            data = _load_json(filepath)
 
             parsed = data.get("parsed_data", {})
 
@@ -525,17 +876,19 @@ class InterfaceTransformer:
                 raw_neighbors = self._parse_cdp_raw_output(data.get("raw_output", ""))
 
             for nbr in raw_neighbors:
-                neighbor_record = {
-                    "id": str(uuid.uuid4()),
-                    "local_router": device_name,
-                    # Normalize interface names to ensure CDP correlation works with deduplicated interfaces
-                    "local_interface": self._normalize_interface_name(nbr.get("local_interface", "")),
-                    "remote_router": nbr.get("device_id", "").split(".")[0],  # Remove domain
-                    "remote_interface": self._normalize_interface_name(nbr.get("remote_interface", "")),
-                    "remote_platform": nbr.get("platform", ""),
-                    "remote_ip": nbr.get("ip_address", ""),
-                    "updated_at": datetime.now().isoformat()
-                }
+                # Normalize interface names to ensure CDP correlation works with deduplicated interfaces
+                local_interface = self._normalize_interface_name(nbr.get("local_interface", ""))
+                remote_router = nbr.get("device_id", "").split(".")[0]  # Remove domain
+                neighbor_record = CdpNeighborRecord(
+                    id=f"{device_name}|{local_interface}|{remote_router}",
+                    local_router=device_name,
+                    local_interface=local_interface,
+                    remote_router=remote_router,
+                    remote_interface=self._normalize_interface_name(nbr.get("remote_interface", "")),
+                    remote_platform=nbr.get("platform", ""),
+                    remote_ip=nbr.get("ip_address", ""),
+                    updated_at=updated_at
+                )
 
                 neighbors.append(neighbor_record)
 
@@ -566,86 +919,20 @@ class InterfaceTransformer:
         return neighbors
 
     def _is_physical_interface(self, interface: str) -> bool:
-        """Check if interface is physical (not subinterface/bundle member)"""
-        # Subinterfaces contain "."
-        if "." in interface:
-            return False
-        # Bundle-Ether members
-        if interface.startswith("BE") and "/" in interface:
-            return False
-        return True
+        """Forwards to the memoized module-level _is_physical_interface_cached()"""
+        return _is_physical_interface_cached(interface)
 
     def _get_parent_interface(self, interface: str) -> Optional[str]:
-        """Get parent interface for subinterfaces"""
-        if "." in interface:
-            return interface.split(".")[0]
-        return None
+        """Forwards to the memoized module-level _get_parent_interface_cached()"""
+        return _get_parent_interface_cached(interface)
 
     def _get_capacity_from_interface_type(self, interface: str) -> str:
-        """
-        Get capacity class DIRECTLY from IOS-XR interface type designation.
-
-        Uses interface naming convention - no bandwidth calculations:
-        - HundredGigE / Hu = 100G
-        - TenGigE / Te = 10G
-        - GigabitEthernet / Gi = 1G
-        - FastEthernet / Fa = 100M
-        - Bundle-Ether / BE = 10G (default for LAG)
-        """
-        intf = interface.upper()
-
-        # 100 Gigabit Ethernet (HundredGigE, Hu)
-        if intf.startswith(("HUNDREDGIGE", "HU")):
-            return "100G"
-
-        # 40 Gigabit Ethernet (FortyGigE, Fo)
-        elif intf.startswith(("FORTYGIGE", "FO")):
-            return "40G"
-
-        # 25 Gigabit Ethernet (TwentyFiveGigE, Tf)
-        elif intf.startswith(("TWENTYFIVEGIGE", "TF")):
-            return "25G"
-
-        # 10 Gigabit Ethernet (TenGigE, Te)
-        elif intf.startswith(("TENGIGE", "TE", "TENGIGABITETHERNET")):
-            return "10G"
-
-        # 1 Gigabit Ethernet (GigabitEthernet, Gi)
-        elif intf.startswith(("GIGABITETHERNET", "GI")):
-            return "1G"
-
-        # Fast Ethernet (FastEthernet, Fa)
-        elif intf.startswith(("FASTETHERNET", "FA")):
-            return "100M"
-
-        # Bundle-Ether (BE) - LAG aggregate
-        # Actual capacity = sum of member physical interfaces
-        # Without show bundle data, mark as "LAG" (unknown aggregate)
-        elif intf.startswith(("BUNDLE-ETHER", "BE")):
-            return "LAG"
-
-        # Loopback (Lo)
-        elif intf.startswith(("LOOPBACK", "LO")):
-            return "1G"
-
-        # Unknown type defaults to 1G
-        else:
-            return "1G"
+        """Forwards to the memoized module-level _get_capacity_from_interface_type_cached()"""
+        return _get_capacity_from_interface_type_cached(interface)
 
     def _get_hardware_interface_bandwidth(self, interface: str) -> int:
-        """Get bandwidth in kbps based on interface type designation."""
-        capacity = self._get_capacity_from_interface_type(interface)
-        bandwidth_map = {
-            "100G": 100000000,
-            "40G": 40000000,
-            "25G": 25000000,
-            "10G": 10000000,
-            "1G": 1000000,
-            "100M": 100000,
-            "10M": 10000,
-            "LAG": 0,  # LAG bandwidth unknown without show bundle data
-        }
-        return bandwidth_map.get(capacity, 1000000)
+        """Forwards to the memoized module-level _get_hardware_interface_bandwidth_cached()"""
+        return _get_hardware_interface_bandwidth_cached(interface)
 
     def _get_capacity_class_from_bandwidth(self, bw_kbps: int) -> str:
         """Convert bandwidth to capacity class (fallback method)."""
@@ -675,254 +962,278 @@ class InterfaceTransformer:
 
         return self._get_capacity_class_from_bandwidth(bw_kbps)
 
-    def _correlate_interfaces_with_cdp(self, interfaces: List[Dict], cdp_neighbors: List[Dict]):
+    def _correlate_interfaces_with_cdp(self, interfaces: List[InterfaceRecord], cdp_neighbors: List[CdpNeighborRecord]):
         """Correlate interfaces with their CDP-discovered neighbors"""
-        # Build lookup: (router, interface) -> CDP neighbor
-        cdp_lookup = {}
-        for nbr in cdp_neighbors:
-            key = (nbr["local_router"], nbr["local_interface"])
-            cdp_lookup[key] = nbr
+        # Build lookup: (router, interface) -> CDP neighbor (last one wins, as before)
+        cdp_lookup = {(nbr.local_router, nbr.local_interface): nbr for nbr in cdp_neighbors}
+        lookup = cdp_lookup.get
 
-        # Update interfaces with neighbor info
+        # Update interfaces with neighbor info (one dict probe per interface)
         for intf in interfaces:
-            key = (intf["router"], intf["interface"])
-            if key in cdp_lookup:
-                nbr = cdp_lookup[key]
-                intf["neighbor_router"] = nbr["remote_router"]
-                intf["neighbor_interface"] = nbr["remote_interface"]
+            nbr = lookup((intf.router, intf.interface))
+            if nbr is not None:
+                intf.neighbor_router = nbr.remote_router
+                intf.neighbor_interface = nbr.remote_interface
 
-    def _save_interfaces_to_db(self, interfaces: List[Dict]):
+    def _save_interfaces_to_db(self, interfaces: List[InterfaceRecord]):
         """Save interfaces to database"""
-        conn = sqlite3.connect(TOPOLOGY_DB)
-        conn.execute("PRAGMA foreign_keys = ON")
-        cursor = conn.cursor()
+        with _get_pool().get_write() as conn:
+            cursor = conn.cursor()
 
-        # Ensure table exists
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS interface_capacity (
-                id TEXT PRIMARY KEY,
-                router TEXT NOT NULL,
-                interface TEXT NOT NULL,
-                description TEXT,
-                admin_status TEXT,
-                line_protocol TEXT,
-                bw_kbps INTEGER DEFAULT 0,
-                capacity_class TEXT,
-                input_rate_bps INTEGER DEFAULT 0,
-                output_rate_bps INTEGER DEFAULT 0,
-                input_utilization_pct REAL DEFAULT 0,
-                output_utilization_pct REAL DEFAULT 0,
-                mac_address TEXT,
-                mtu INTEGER,
-                encapsulation TEXT,
-                is_physical INTEGER DEFAULT 1,
-                parent_interface TEXT,
-                neighbor_router TEXT,
-                neighbor_interface TEXT,
-                updated_at TEXT,
-                UNIQUE(router, interface)
-            )
-        """)
+            # Ensure table exists
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS interface_capacity (
+                    id TEXT PRIMARY KEY,
+                    router TEXT NOT NULL,
+                    interface TEXT NOT NULL,
+                    description TEXT,
+                    admin_status TEXT,
+                    line_protocol TEXT,
+                    bw_kbps INTEGER DEFAULT 0,
+                    capacity_class TEXT,
+                    input_rate_bps INTEGER DEFAULT 0,
+                    output_rate_bps INTEGER DEFAULT 0,
+                    input_utilization_pct REAL DEFAULT 0,
+                    output_utilization_pct REAL DEFAULT 0,
+                    mac_address TEXT,
+                    mtu INTEGER,
+                    encapsulation TEXT,
+                    is_physical INTEGER DEFAULT 1,
+                    parent_interface TEXT,
+                    neighbor_router TEXT,
+                    neighbor_interface TEXT,
+                    updated_at TEXT,
+                    UNIQUE(router, interface)
+                )
+            """)
 
-        for intf in interfaces:
+            rows = [_interface_row(intf) for intf in interfaces]
             try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO interface_capacity
-                    (id, router, interface, description, admin_status, line_protocol,
-                     bw_kbps, capacity_class, input_rate_bps, output_rate_bps,
-                     input_utilization_pct, output_utilization_pct, mac_address, mtu,
-                     encapsulation, is_physical, parent_interface, neighbor_router,
-                     neighbor_interface, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    intf["id"], intf["router"], intf["interface"],
-                    intf.get("description"), intf.get("admin_status"), intf.get("line_protocol"),
-                    intf.get("bw_kbps", 0), intf.get("capacity_class"),
-                    intf.get("input_rate_bps", 0), intf.get("output_rate_bps", 0),
-                    intf.get("input_utilization_pct", 0), intf.get("output_utilization_pct", 0),
-                    intf.get("mac_address"), intf.get("mtu"),
-                    intf.get("encapsulation"), intf.get("is_physical", 1),
-                    intf.get("parent_interface"), intf.get("neighbor_router"),
-                    intf.get("neighbor_interface"), intf.get("updated_at")
-                ))
-            except Exception as e:
-                logger.error(f"Error saving interface {intf['router']}/{intf['interface']}: {e}")
+                # One statement, one transaction for the whole batch; take the write
+                # lock up front rather than upgrading a deferred transaction mid-batch
+                conn.execute("BEGIN IMMEDIATE")
+                if SQLITE_HAS_JSON1:
+                    # Bind the whole batch once as a JSON array instead of once per row
+                    cursor.execute(INSERT_INTERFACE_JSON_SQL, (_dump_json(rows),))
+                else:
+                    cursor.executemany(INSERT_INTERFACE_SQL, rows)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                # A bad row (or one JSON can't encode) aborts the batch;
+                # redo row by row so the others are still saved
+                logger.warning(f"⚠️  Batched interface insert failed ({e}), retrying row by row")
+                conn.rollback()
+                for row in rows:
+                    try:
+                        cursor.execute(INSERT_INTERFACE_SQL, row)
+                    except sqlite3.Error as e:
+                        logger.error(f"Error saving interface {row[1]}/{row[2]}: {e}")
 
-        conn.commit()
-        conn.close()
+            # Rebuild the summary roll-up in the same transaction as the rows it counts
+            self._refresh_interface_summary(cursor, datetime.now().isoformat())
+            conn.commit()
 
-    def _save_cdp_to_db(self, cdp_neighbors: List[Dict]):
-        """Save CDP neighbors to database"""
-        conn = sqlite3.connect(TOPOLOGY_DB)
-        conn.execute("PRAGMA foreign_keys = ON")
-        cursor = conn.cursor()
+    def _refresh_interface_summary(self, cursor: sqlite3.Cursor, refreshed_at: str):
+        """
+        Rebuild mv_interface_summary from interface_capacity.
+
+        The caller commits, so the roll-up changes atomically with the rows.
 
-        # Ensure table exists
+        Args:
+            cursor: Cursor on the writer connection
+            refreshed_at: Timestamp stored with every roll-up row
+        """
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cdp_neighbors (
-                id TEXT PRIMARY KEY,
-                local_router TEXT NOT NULL,
-                local_interface TEXT NOT NULL,
-                remote_router TEXT NOT NULL,
-                remote_interface TEXT,
-                remote_platform TEXT,
-                remote_ip TEXT,
-                updated_at TEXT,
-                UNIQUE(local_router, local_interface, remote_router)
+            CREATE TABLE IF NOT EXISTS mv_interface_summary (
+                capacity_class TEXT,
+                router TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                physical INTEGER NOT NULL,
+                high_utilization INTEGER NOT NULL,
+                refreshed_at TEXT
             )
         """)
+        cursor.execute("DELETE FROM mv_interface_summary")
+        cursor.execute("""
+            INSERT INTO mv_interface_summary
+            SELECT capacity_class, router, COUNT(*),
+                   SUM(CASE WHEN is_physical = 1 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN input_utilization_pct > 50 OR output_utilization_pct > 50 THEN 1 ELSE 0 END),
+                   ?
+            FROM interface_capacity
+            GROUP BY capacity_class, router
+        """, (refreshed_at,))
+
+    def _save_cdp_to_db(self, cdp_neighbors: List[CdpNeighborRecord]):
+        """Save CDP neighbors to database"""
+        with _get_pool().get_write() as conn:
+            cursor = conn.cursor()
 
-        for nbr in cdp_neighbors:
+            # Ensure table exists
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cdp_neighbors (
+                    id TEXT PRIMARY KEY,
+                    local_router TEXT NOT NULL,
+                    local_interface TEXT NOT NULL,
+                    remote_router TEXT NOT NULL,
+                    remote_interface TEXT,
+                    remote_platform TEXT,
+                    remote_ip TEXT,
+                    updated_at TEXT,
+                    UNIQUE(local_router, local_interface, remote_router)
+                )
+            """)
+
+            rows = [_cdp_row(nbr) for nbr in cdp_neighbors]
             try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO cdp_neighbors
-                    (id, local_router, local_interface, remote_router, remote_interface,
-                     remote_platform, remote_ip, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    nbr["id"], nbr["local_router"], nbr["local_interface"],
-                    nbr["remote_router"], nbr.get("remote_interface"),
-                    nbr.get("remote_platform"), nbr.get("remote_ip"),
-                    nbr.get("updated_at")
-                ))
-            except Exception as e:
-                logger.error(f"Error saving CDP neighbor {nbr['local_router']}/{nbr['local_interface']}: {e}")
+                # One statement, one transaction for the whole batch
+                conn.execute("BEGIN IMMEDIATE")
+                cursor.executemany(INSERT_CDP_SQL, rows)
+            except sqlite3.Error as e:
+                # A bad row aborts executemany; redo row by row so the others are still saved
+                logger.warning(f"⚠️  Batched CDP insert failed ({e}), retrying row by row")
+                conn.rollback()
+                for row in rows:
+                    try:
+                        cursor.execute(INSERT_CDP_SQL, row)
+                    except sqlite3.Error as e:
+                        logger.error(f"Error saving CDP neighbor {row[1]}/{row[2]}: {e}")
 
-        conn.commit()
-        conn.close()
+            conn.commit()
 
     def get_interface_summary(self) -> Dict:
         """Get summary of interface capacity data"""
-        conn = sqlite3.connect(TOPOLOGY_DB)
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        summary = {
-            "total_interfaces": 0,
-            "physical_interfaces": 0,
-            "logical_interfaces": 0,
-            "by_capacity_class": {},
-            "by_router": {},
-            "high_utilization": [],
-            "timestamp": datetime.now().isoformat()
-        }
-
-        try:
-            # Total counts
-            cursor.execute("SELECT COUNT(*) FROM interface_capacity")
-            summary["total_interfaces"] = cursor.fetchone()[0]
-
-            cursor.execute("SELECT COUNT(*) FROM interface_capacity WHERE is_physical = 1")
-            summary["physical_interfaces"] = cursor.fetchone()[0]
-
-            summary["logical_interfaces"] = summary["total_interfaces"] - summary["physical_interfaces"]
-
-            # By capacity class
-            cursor.execute("""
-                SELECT capacity_class, COUNT(*) as count
-                FROM interface_capacity
-                GROUP BY capacity_class
-            """)
-            for row in cursor.fetchall():
-                summary["by_capacity_class"][row["capacity_class"] or "Unknown"] = row["count"]
-
-            # By router
-            cursor.execute("""
-                SELECT router, COUNT(*) as count
-                FROM interface_capacity
-                GROUP BY router
-            """)
-            for row in cursor.fetchall():
-                summary["by_router"][row["router"]] = row["count"]
+        with _get_pool().get_read() as conn:
+            cursor = conn.cursor()
+
+            summary = {
+                "total_interfaces": 0,
+                "physical_interfaces": 0,
+                "logical_interfaces": 0,
+                "by_capacity_class": {},
+                "by_router": {},
+                "high_utilization": [],
+                "refreshed_at": None,  # When the counts were last rebuilt
+                "timestamp": datetime.now().isoformat()
+            }
 
-            # High utilization interfaces (>50%)
-            cursor.execute("""
-                SELECT router, interface, input_utilization_pct, output_utilization_pct, bw_kbps
-                FROM interface_capacity
-                WHERE input_utilization_pct > 50 OR output_utilization_pct > 50
-                ORDER BY (input_utilization_pct + output_utilization_pct) DESC
-                LIMIT 20
-            """)
-            for row in cursor.fetchall():
-                summary["high_utilization"].append({
-                    "router": row["router"],
-                    "interface": row["interface"],
-                    "input_pct": row["input_utilization_pct"],
-                    "output_pct": row["output_utilization_pct"],
-                    "bw_kbps": row["bw_kbps"]
-                })
+            try:
+                # Counts come from the roll-up rebuilt by _save_interfaces_to_db
+                try:
+                    cursor.execute(SELECT_INTERFACE_SUMMARY_SQL)
+                except sqlite3.OperationalError as e:
+                    if "no such table" not in str(e):
+                        raise
+                    # Database predates the roll-up table: build it once from interface_capacity
+                    with _get_pool().get_write() as write_conn:
+                        self._refresh_interface_summary(write_conn.cursor(), datetime.now().isoformat())
+                        write_conn.commit()
+                    cursor.execute(SELECT_INTERFACE_SUMMARY_SQL)
+
+                by_class = {}
+                by_router = {}
+                high_utilization_count = 0
+                for row in cursor.fetchall():
+                    summary["total_interfaces"] += row["total"]
+                    summary["physical_interfaces"] += row["physical"]
+                    high_utilization_count += row["high_utilization"]
+                    by_class[row["capacity_class"]] = by_class.get(row["capacity_class"], 0) + row["total"]
+                    by_router[row["router"]] = by_router.get(row["router"], 0) + row["total"]
+                    summary["refreshed_at"] = row["refreshed_at"]
+
+                summary["logical_interfaces"] = summary["total_interfaces"] - summary["physical_interfaces"]
+
+                # By capacity class
+                for capacity_class, count in by_class.items():
+                    summary["by_capacity_class"][capacity_class or "Unknown"] = count
+
+                # By router
+                for router in sorted(by_router):
+                    summary["by_router"][router] = by_router[router]
+
+                # High utilization interfaces (>50%), only scanned for when there are any
+                if high_utilization_count:
+                    cursor.execute("""
+                        SELECT router, interface, input_utilization_pct, output_utilization_pct, bw_kbps
+                        FROM interface_capacity
+                        WHERE input_utilization_pct > 50 OR output_utilization_pct > 50
+                        ORDER BY (input_utilization_pct + output_utilization_pct) DESC
+                        LIMIT 20
+                    """)
+                    for row in cursor.fetchall():
+                        summary["high_utilization"].append({
+                            "router": row["router"],
+                            "interface": row["interface"],
+                            "input_pct": row["input_utilization_pct"],
+                            "output_pct": row["output_utilization_pct"],
+                            "bw_kbps": row["bw_kbps"]
+                        })
 
-        except Exception as e:
-            logger.error(f"Error getting interface summary: {e}")
+            except Exception as e:
+                logger.error(f"Error getting interface summary: {e}")
 
-        conn.close()
         return summary
 
     def get_traffic_matrix(self) -> Dict:
         """Build traffic matrix between countries/routers based on interface data"""
-        conn = sqlite3.connect(TOPOLOGY_DB)
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with _get_pool().get_read() as conn:
+            cursor = conn.cursor()
 
-        traffic_matrix = {
-            "links": [],
-            "by_country": {},
-            "total_traffic_bps": 0,
-            "timestamp": datetime.now().isoformat()
-        }
-
-        try:
-            # Get all interfaces with neighbors
-            cursor.execute("""
-                SELECT ic.router, ic.interface, ic.neighbor_router, ic.neighbor_interface,
-                       ic.input_rate_bps, ic.output_rate_bps, ic.bw_kbps, ic.capacity_class,
-                       n1.country as source_country, n2.country as target_country
-                FROM interface_capacity ic
-                LEFT JOIN nodes n1 ON ic.router = n1.name
-                LEFT JOIN nodes n2 ON ic.neighbor_router = n2.name
-                WHERE ic.neighbor_router IS NOT NULL AND ic.neighbor_router != ''
-            """)
+            traffic_matrix = {
+                "links": [],
+                "by_country": {},
+                "total_traffic_bps": 0,
+                "timestamp": datetime.now().isoformat()
+            }
 
-            for row in cursor.fetchall():
-                link = {
-                    "source_router": row["router"],
-                    "source_interface": row["interface"],
-                    "target_router": row["neighbor_router"],
-                    "target_interface": row["neighbor_interface"],
-                    "source_country": row["source_country"] or "Unknown",
-                    "target_country": row["target_country"] or "Unknown",
-                    "input_bps": row["input_rate_bps"],
-                    "output_bps": row["output_rate_bps"],
-                    "capacity_kbps": row["bw_kbps"],
-                    "capacity_class": row["capacity_class"]
-                }
-                traffic_matrix["links"].append(link)
-                traffic_matrix["total_traffic_bps"] += row["input_rate_bps"] + row["output_rate_bps"]
-
-                # Aggregate by country pair
-                src_country = row["source_country"] or "Unknown"
-                tgt_country = row["target_country"] or "Unknown"
-                country_key = f"{src_country}->{tgt_country}"
-
-                if country_key not in traffic_matrix["by_country"]:
-                    traffic_matrix["by_country"][country_key] = {
-                        "source": src_country,
-                        "target": tgt_country,
-                        "total_input_bps": 0,
-                        "total_output_bps": 0,
-                        "link_count": 0
+            try:
+                # Get all interfaces with neighbors
+                cursor.execute("""
+                    SELECT ic.router, ic.interface, ic.neighbor_router, ic.neighbor_interface,
+                           ic.input_rate_bps, ic.output_rate_bps, ic.bw_kbps, ic.capacity_class,
+                           n1.country as source_country, n2.country as target_country
+                    FROM interface_capacity ic
+                    LEFT JOIN nodes n1 ON ic.router = n1.name
+                    LEFT JOIN nodes n2 ON ic.neighbor_router = n2.name
+                    WHERE ic.neighbor_router IS NOT NULL AND ic.neighbor_router != ''
+                """)
+
+                for row in cursor.fetchall():
+                    link = {
+                        "source_router": row["router"],
+                        "source_interface": row["interface"],
+                        "target_router": row["neighbor_router"],
+                        "target_interface": row["neighbor_interface"],
+                        "source_country": row["source_country"] or "Unknown",
+                        "target_country": row["target_country"] or "Unknown",
+                        "input_bps": row["input_rate_bps"],
+                        "output_bps": row["output_rate_bps"],
+                        "capacity_kbps": row["bw_kbps"],
+                        "capacity_class": row["capacity_class"]
                     }
+                    traffic_matrix["links"].append(link)
+                    traffic_matrix["total_traffic_bps"] += row["input_rate_bps"] + row["output_rate_bps"]
+
+                    # Aggregate by country pair
+                    src_country = row["source_country"] or "Unknown"
+                    tgt_country = row["target_country"] or "Unknown"
+                    country_key = f"{src_country}->{tgt_country}"
+
+                    if country_key not in traffic_matrix["by_country"]:
+                        traffic_matrix["by_country"][country_key] = {
+                            "source": src_country,
+                            "target": tgt_country,
+                            "total_input_bps": 0,
+                            "total_output_bps": 0,
+                            "link_count": 0
+                        }
+
+                    traffic_matrix["by_country"][country_key]["total_input_bps"] += row["input_rate_bps"]
+                    traffic_matrix["by_country"][country_key]["total_output_bps"] += row["output_rate_bps"]
+                    traffic_matrix["by_country"][country_key]["link_count"] += 1
 
-                traffic_matrix["by_country"][country_key]["total_input_bps"] += row["input_rate_bps"]
-                traffic_matrix["by_country"][country_key]["total_output_bps"] += row["output_rate_bps"]
-                traffic_matrix["by_country"][country_key]["link_count"] += 1
-
-        except Exception as e:
-            logger.error(f"Error building traffic matrix: {e}")
+            except Exception as e:
+                logger.error(f"Error building traffic matrix: {e}")
 
-        conn.close()
         return traffic_matrix
 
 
@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 # Default OSPF cost for GigabitEthernet interfaces
 DEFAULT_OSPF_COST = 1
 
+# Deletion table for newlines/carriage returns/tabs in CDP interface fields
+_CTRL_DELETE = str.maketrans('', '', '\n\r\t')
+
 class TopologyBuilder:
     """Builds network topology from parsed device data"""
 
@@ -116,7 +119,7 @@ class TopologyBuilder:
             return "Unknown"
 
         # Remove newlines, carriage returns, tabs
-        interface = interface.replace('\n', '').replace('\r', '').replace('\t', '')
+        interface = interface.translate(_CTRL_DELETE)
 
         # Remove "Holdtime" and other CDP garbage that might leak through
         interface = re.sub(r'Holdtime.*', '', interface, flags=re.IGNORECASE)
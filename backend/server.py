@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException, Request, Response, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, FileResponse
 from pydantic import BaseModel
 import asyncio
 from typing import List, Optional
@@ -316,6 +316,10 @@ class Device(BaseModel):
 class BulkDeleteRequest(BaseModel):
     ids: List[str]
 
+class FileBulkDeleteRequest(BaseModel):
+    filenames: List[str]
+    folder_type: str = "text"
+
 class DbActionRequest(BaseModel):
     action: str # 'reset', 'seed'
 
@@ -1800,7 +1804,7 @@ async def get_jumphost_config():
         from modules.connection_manager import load_jumphost_config, connection_manager
 
         config = load_jumphost_config()
-        status = connection_manager.get_jumphost_status()
+        status = connection_manager.get_jumphost_status(config)
 
         return {
             'enabled': config.get('enabled', False),
@@ -1931,22 +1935,17 @@ async def automation_files(folder_type: str = "text", device_name: Optional[str]
 @app.get("/api/automation/files/{filename}")
 async def automation_file_content(filename: str, folder_type: str = "text"):
     """Get content of a specific file"""
-    try:
-        # Security: Prevent path traversal attacks
-        if '..' in filename or '/' in filename or '\\' in filename:
-            raise HTTPException(status_code=400, detail="Invalid filename: path traversal not allowed")
-
-        # Additional sanitization: use only basename
-        safe_filename = os.path.basename(filename)
-        if safe_filename != filename:
-            raise HTTPException(status_code=400, detail="Invalid filename format")
-
-        from modules.file_manager import get_file_manager
+    from modules.file_manager import get_file_manager
 
-        fm = get_file_manager()  # Fresh instance using 'current' symlink
-        file_data = fm.get_file_content(safe_filename, folder_type)
+    fm = get_file_manager()  # Fresh instance using 'current' symlink
+    # Security: rejects traversal and hidden names before touching the filesystem
+    try:
+        fm.resolve_path(filename, folder_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        return file_data
+    try:
+        return fm.get_file_content(filename, folder_type)
 
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File not found: {filename}")
@@ -1956,6 +1955,44 @@ async def automation_file_content(filename: str, folder_type: str = "text"):
         logger.error(f"❌ File read failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File read failed: {str(e)}")
 
+@app.get("/api/automation/files/{filename}/download")
+async def automation_file_download(filename: str, folder_type: str = "text"):
+    """Download a file as-is (streamed from disk, not wrapped in JSON)"""
+    from modules.file_manager import get_file_manager
+
+    fm = get_file_manager()  # Fresh instance using 'current' symlink
+    # Security: same filename rules as the other file endpoints (no traversal, no hidden files)
+    try:
+        filepath = fm.resolve_path(filename, folder_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not os.path.isfile(filepath):
+        raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+
+    media_type = "application/json" if folder_type == "json" else "text/plain; charset=utf-8"
+    # FileResponse streams fixed-size chunks from disk, so memory use does not grow with the file.
+    # Content-Disposition takes the name of the validated on-disk file, not the raw request value
+    return FileResponse(filepath, media_type=media_type, filename=os.path.basename(filepath))
+
+@app.post("/api/automation/files/bulk-delete")
+async def automation_files_bulk_delete(request: FileBulkDeleteRequest):
+    """Delete several automation output files in one request"""
+    if not request.filenames:
+        raise HTTPException(status_code=400, detail="No filenames provided")
+
+    try:
+        from modules.file_manager import get_file_manager
+
+        fm = get_file_manager()  # Fresh instance using 'current' symlink
+        # Security: delete_files() validates every name before removing anything
+        return fm.delete_files(request.filenames, request.folder_type)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Bulk file delete failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Bulk file delete failed: {str(e)}")
+
 @app.get("/api/automation/executions")
 async def list_executions():
     """List all past executions"""
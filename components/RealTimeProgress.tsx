@@ -5,7 +5,7 @@ import { GlassCard } from './ui/GlassCard';
 interface DeviceProgress {
     device_name: string;
     country: string;
-    status: 'pending' | 'connecting' | 'connected' | 'running' | 'executing' | 'disconnecting' | 'disconnected' | 'completed' | 'failed' | 'connection_failed';
+    status: 'pending' | 'connecting' | 'connected' | 'running' | 'executing' | 'disconnecting' | 'disconnected' | 'released' | 'completed' | 'failed' | 'connection_failed';
     current_command?: string;
     completed_commands: number;
     total_commands: number;
@@ -98,6 +98,7 @@ const StatusBadge: React.FC<{ status: string }> = ({ status }) => {
         executing: 'bg-blue-100 text-blue-700 dark:bg-blue-900/40 dark:text-blue-300 animate-pulse',
         disconnecting: 'bg-orange-100 text-orange-700 dark:bg-orange-900/40 dark:text-orange-300 animate-pulse',
         disconnected: 'bg-gray-100 text-gray-700 dark:bg-gray-700 dark:text-gray-300',
+        released: 'bg-gray-100 text-gray-700 dark:bg-gray-700 dark:text-gray-300',
         completed: 'bg-green-100 text-green-700 dark:bg-green-900/40 dark:text-green-300',
         failed: 'bg-red-100 text-red-700 dark:bg-red-900/40 dark:text-red-300',
         connection_failed: 'bg-red-100 text-red-700 dark:bg-red-900/40 dark:text-red-300',
@@ -350,6 +351,7 @@ export const RealTimeProgress: React.FC<RealTimeProgressProps> = ({
                                     pending: 4,
                                     completed: 5,
                                     disconnected: 6,
+                                    released: 6,
                                     failed: 7,
                                     connection_failed: 8
                                 };
@@ -11,7 +11,7 @@ import sqlite3
 # Add backend modules to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from modules.device_encryption import encrypt_password, is_encrypted, get_encryption_status
+from modules.device_encryption import migrate_passwords_bulk, is_encrypted, get_encryption_status
 
 def migrate_passwords(db_path='backend/data/devices.db', dry_run=False):
     """
@@ -82,19 +82,22 @@ def migrate_passwords(db_path='backend/data/devices.db', dry_run=False):
         else:
             print(f"\n🔄 Encrypting {plaintext_count} passwords...")
             
-            for device_id, device_name, plaintext_password in migrated_devices:
-                try:
-                    encrypted_password = encrypt_password(plaintext_password)
-                    cursor.execute(
-                        "UPDATE devices SET password = ? WHERE id = ?",
-                        (encrypted_password, device_id)
+            device_names = {device_id: device_name for device_id, device_name, _ in migrated_devices}
+            try:
+                updates = [
+                    (encrypted_password, device_id)
+                    for device_id, encrypted_password in migrate_passwords_bulk(
+                        (device_id, plaintext_password) for device_id, _, plaintext_password in migrated_devices
                     )
-                    print(f"  ✅ {device_name}: Encrypted successfully")
-                except Exception as e:
-                    print(f"  ❌ {device_name}: Failed to encrypt - {e}")
-                    conn.rollback()
-                    conn.close()
-                    return False
+                ]
+                cursor.executemany("UPDATE devices SET password = ? WHERE id = ?", updates)
+            except Exception as e:
+                print(f"  ❌ Failed to encrypt passwords - {e}")
+                conn.rollback()
+                conn.close()
+                return False
+            for _, device_id in updates:
+                print(f"  ✅ {device_names[device_id]}: Encrypted successfully")
             
             conn.commit()
             print(f"\n✅ Successfully encrypted {plaintext_count} passwords!")